@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the crawler and tweet scheduler hot paths
+
+Runs entirely against the recorded fixtures in benchmarks/fixtures (scaled up
+synthetically where larger inputs are needed) and never touches the network.
+Results are written as JSON so runs from different commits can be compared.
+
+Usage:
+python benchmarks/run_benchmarks.py --output bench.json
+python benchmarks/run_benchmarks.py --quick --compare bench.json
+python benchmarks/run_benchmarks.py --filter classify
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT / "scripts"))
+sys.path.insert(0, str(ROOT / "tweet-scheduler"))
+
+
+class ReplayResponse:
+    """Just enough of requests.Response to replay a recorded body"""
+
+    def __init__(self, body):
+        self.content = body
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class ReplaySession:
+    """Serves recorded bodies by URL instead of going to the network"""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def get(self, url, **kwargs):
+        return ReplayResponse(self.bodies[url])
+
+
+def synthetic_repo_infos(count):
+    """Repository infos shaped like search results, varied from the fixture page"""
+    with open(FIXTURES / "search_repositories.json") as f:
+        items = json.load(f)["items"]
+    rng = random.Random(42)
+    words = ["docker", "ai", "agent", "compose", "gpu", "pipeline", "health", "tool",
+             "maintain", "stack", "learning", "serving", "monitoring", "chat", "api"]
+    infos = []
+    for i in range(count):
+        item = items[i % len(items)]
+        infos.append({
+            "name": f"{item['name']}-{i}",
+            "description": item["description"] + " " + " ".join(rng.sample(words, 4)),
+            "topics": item["topics"] + rng.sample(words, 2),
+        })
+    return infos
+
+
+def synthetic_awesome_readme(target_bytes):
+    """Grow the real awesome list README to about target_bytes by repeating rows"""
+    lines = (ROOT / "README.md").read_text(encoding="utf-8").split("\n")
+    output = []
+    size = sum(len(line) + 1 for line in lines)
+    for i, line in enumerate(lines):
+        output.append(line)
+        is_row = line.startswith("| ") and not line.startswith("| Title") and \
+            not line.startswith("| Project")
+        next_is_row = i + 1 < len(lines) and lines[i + 1].startswith("|")
+        if is_row and not next_is_row:
+            # Last row of a table: pad the table until the file is big enough
+            copy = 0
+            while size < target_bytes * (i + 1) / len(lines):
+                row = line.replace("](https://", f"](https://copy{copy}.")
+                output.append(row)
+                size += len(row) + 1
+                copy += 1
+    return "\n".join(output)
+
+
+def synthetic_kubetools_readme(sections, rows_per_section):
+    """A kubetools-style README with the given number of tool tables"""
+    parts = ["# Kubetools - A Curated List of Kubernetes Tools\n"]
+    for s in range(sections):
+        parts.append(f"## Category {s}\n")
+        parts.append("| Sr No | Tool | Description | Popularity |")
+        parts.append("|-------|------|-------------|------------|")
+        for r in range(rows_per_section):
+            parts.append(
+                f"| {r + 1} | tool-{s}-{r} | [Tool {s}-{r} manages Kubernetes things]"
+                f"(https://github.com/example/tool-{s}-{r}) | "
+                f"![Github Stars](https://img.shields.io/github/stars/example/tool-{s}-{r}) |")
+        parts.append("")
+    return "\n".join(parts)
+
+
+def synthetic_rss(count, now):
+    """An RSS feed of count items, one per day going back from now"""
+    items = []
+    for i in range(count):
+        title = "Docker AI Story" if i % 2 == 0 else "Compose Release Notes"
+        items.append(
+            f"<item><title>{title} {i}</title>"
+            f"<link>https://blog.example.com/post-{i}/</link>"
+            f"<description><![CDATA[<p>Article number {i} about containers &amp; models.</p>]]>"
+            f"</description><pubDate>{format_datetime(now - timedelta(days=i))}</pubDate></item>")
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            "<title>Synthetic</title><link>https://blog.example.com</link>" +
+            "".join(items) + "</channel></rss>").encode("utf-8")
+
+
+def measure(fn, repeat):
+    """Run fn repeat times and return the wall-clock durations"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def result(name, params, times, items):
+    median = statistics.median(times)
+    return {
+        "name": name,
+        "params": params,
+        "repeat": len(times),
+        "min_s": min(times),
+        "median_s": median,
+        "mean_s": statistics.mean(times),
+        "items": items,
+        "items_per_s": items / median if median else None,
+    }
+
+
+def bench_classify(sizes, repeat):
+    import github_crawler as crawler
+    for count in sizes:
+        infos = synthetic_repo_infos(count)
+
+        def run():
+            for info in infos:
+                if crawler.has_docker_and_ai_ml(info):
+                    crawler.determine_category(info)
+
+        yield result("classify", {"repos": count}, measure(run, repeat), count)
+
+
+def bench_crawl_pipeline(sizes, repeat):
+    import github_crawler as crawler
+    import crawl_pipeline as pipeline
+    from readme_index import ReadmeIndex
+    with open(FIXTURES / "search_repositories.json") as f:
+        items = json.load(f)["items"]
+    queries = [f"query {i}" for i in range(8)]
+    for count in sizes:
+        per_query = count // len(queries)
+
+        def search(query):
+            # Stream search-result payloads without holding them, like paged results
+            offset = queries.index(query) * per_query
+            for i in range(offset, offset + per_query):
+                item = items[i % len(items)]
+                yield dict(item, id=i, name=f"{item['name']}-{i}", full_name=f"{item['full_name']}-{i}",
+                           html_url=f"{item['html_url']}-{i}")
+
+        def run():
+            candidates = pipeline.search_stage(queries, search)
+            candidates = pipeline.skip_known(candidates, index=ReadmeIndex())
+            for _ in pipeline.classify_stage(candidates, crawler.classify_repository):
+                pass
+
+        yield result("crawl_pipeline", {"repos": count}, measure(run, repeat), count)
+
+
+def bench_readme_insert(sizes, repeat):
+    import github_crawler as crawler
+    from catalog import Catalog, Entry
+    for target in sizes:
+        readme = synthetic_awesome_readme(target)
+        catalog_text = Catalog.from_markdown(readme).dumps()
+        entries = [Entry(category, "Benchmark Entry", "Inserted by the benchmark", "Project", "View",
+                         f"https://example.com/{i}")
+                   for i, category in enumerate(crawler.CATEGORIES)]
+
+        def run():
+            crawler.add_entries_to_catalog(Catalog.loads(catalog_text), readme, entries)
+
+        yield result("readme_insert", {"bytes": len(readme), "entries": len(entries)},
+                     measure(run, repeat), len(entries))
+
+
+def bench_search_blogs(sizes, repeat):
+    import github_crawler as crawler
+    now = datetime.now(timezone.utc)
+    for count in sizes:
+        session = ReplaySession({
+            "https://www.docker.com/blog/tag/ai-ml/feed/": synthetic_rss(count, now),
+            "https://collabnix.com/category/docker/feed/": (FIXTURES / "feed_rss.xml").read_bytes(),
+        })
+
+        def run():
+            crawler.search_blogs(days_ago=count + 1, limit=count, session=session)
+
+        yield result("search_blogs", {"items": count}, measure(run, repeat), count)
+
+
+def bench_extract_tools(sizes, repeat):
+    import tweet_scheduler as scheduler
+    for sections, rows in sizes:
+        readme = synthetic_kubetools_readme(sections, rows)
+        tools = []
+
+        def run():
+            tools[:] = scheduler.extract_tools_from_readme(readme)
+
+        times = measure(run, repeat)
+        yield result("extract_tools_from_readme",
+                     {"bytes": len(readme), "rows": sections * rows, "tools_found": len(tools)},
+                     times, sections * rows)
+
+
+def bench_select_tool(sizes, repeat):
+    import tweet_scheduler as scheduler
+    for count in sizes:
+        tools = [{"category": f"Category {i % 40}", "name": f"tool-{i}", "description": "",
+                  "url": None, "popularity": ""} for i in range(count)]
+        history = scheduler.TweetHistory(f"history-{count}.jsonl")
+        pool = scheduler.ToolPool(tools, history)
+        picks = 100
+
+        def run():
+            # Pick and record, as one scheduler tick does
+            for _ in range(picks):
+                pool.record_tweet(scheduler.select_tool_to_tweet(pool))
+
+        yield result("select_tool_to_tweet", {"tools": count, "picks": picks},
+                     measure(run, repeat), picks)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print median changes against a baseline run, returning the regressions"""
+    with open(baseline_path) as f:
+        baseline = {(r["name"], json.dumps(r["params"], sort_keys=True)): r
+                    for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        base = baseline.get((r["name"], json.dumps(r["params"], sort_keys=True)))
+        if not base:
+            continue
+        ratio = r["median_s"] / base["median_s"] if base["median_s"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  <-- regression"
+            regressions.append(r)
+        print(f"{r['name']:<28} {json.dumps(r['params']):<50} {ratio:6.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the crawler and tweet scheduler")
+    parser.add_argument("--output", help="Write JSON results here instead of stdout")
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs and fewer repeats")
+    parser.add_argument("--repeat", type=int, help="Repetitions per benchmark (default: 5, quick: 2)")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--compare", help="Baseline JSON to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args()
+    repeat = args.repeat or (2 if args.quick else 5)
+
+    if args.quick:
+        plan = {
+            "classify": (bench_classify, [1000]),
+            "crawl_pipeline": (bench_crawl_pipeline, [2000]),
+            "readme_insert": (bench_readme_insert, [10_000, 500_000]),
+            "search_blogs": (bench_search_blogs, [50]),
+            "extract_tools_from_readme": (bench_extract_tools, [(10, 20)]),
+            "select_tool_to_tweet": (bench_select_tool, [1000]),
+        }
+    else:
+        plan = {
+            "classify": (bench_classify, [1000, 20_000]),
+            "crawl_pipeline": (bench_crawl_pipeline, [2000, 50_000]),
+            "readme_insert": (bench_readme_insert, [10_000, 1_000_000, 4_000_000]),
+            "search_blogs": (bench_search_blogs, [50, 500, 5000]),
+            "extract_tools_from_readme": (bench_extract_tools, [(10, 20), (50, 100)]),
+            "select_tool_to_tweet": (bench_select_tool, [1000, 20_000]),
+        }
+
+    # The scheduler logs to a file in the working directory; keep it out of the tree
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.compare) if args.compare else None
+    cwd = os.getcwd()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="benchmarks-") as workdir:
+        os.chdir(workdir)
+        try:
+            for name, (bench, sizes) in plan.items():
+                if args.filter and args.filter not in name:
+                    continue
+                for r in bench(sizes, repeat):
+                    print(f"{r['name']:<28} {json.dumps(r['params']):<50} "
+                          f"{r['median_s'] * 1000:10.2f} ms", file=sys.stderr)
+                    results.append(r)
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if baseline and compare(results, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
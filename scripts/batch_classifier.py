@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Vectorized batch classification of repository and list entries
+
+Reclassifies many records at once: every record is tokenized with the
+crawler's compiled keyword matcher into a sparse document-term matrix, which
+is multiplied by a precomputed term-category matrix to score all records
+against all categories in one step. With the default (binary) weighting the
+result is identical to determine_category, including tie-breaking by
+category order and the "AI/ML Use Cases" default; --idf down-weights
+keywords that appear in many records.
+
+Usage:
+python batch_classifier.py                          # reclassify ../catalog.jsonl
+python batch_classifier.py crawl_dump.jsonl --idf   # one JSON record per line
+
+SciPy is used for the sparse matrices when installed; otherwise NumPy
+dense arrays are used.
+"""
+
+import sys
+import json
+import argparse
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+from github_crawler import CATEGORIES, CLASSIFIER, DOCKER_GROUP, AI_ML_GROUP, repository_text
+from catalog import CATALOG_FILE, Catalog
+
+DEFAULT_CATEGORY = "AI/ML Use Cases"
+
+
+def _term_category_matrix(categories):
+    """Return the (terms x categories) 0/1 matrix for CLASSIFIER's vocabulary"""
+    matrix = np.zeros((len(CLASSIFIER.terms), len(categories)))
+    for t, term in enumerate(CLASSIFIER.terms):
+        for c, category in enumerate(categories):
+            if category in CLASSIFIER.groups_of(term):
+                matrix[t, c] = 1.0
+    return matrix
+
+
+def document_term_matrix(texts):
+    """Tokenize texts into a (documents x terms) binary matrix"""
+    term_index = {term: t for t, term in enumerate(CLASSIFIER.terms)}
+    rows, cols = [], []
+    for d, text in enumerate(texts):
+        for term in CLASSIFIER.find_terms(text):
+            rows.append(d)
+            cols.append(term_index[term])
+    shape = (len(texts), len(CLASSIFIER.terms))
+    data = np.ones(len(rows))
+    if sparse is not None:
+        return sparse.csr_matrix((data, (rows, cols)), shape=shape)
+    matrix = np.zeros(shape)
+    matrix[rows, cols] = data
+    return matrix
+
+
+def idf_weights(doc_term):
+    """Smoothed inverse document frequency of every term"""
+    n = doc_term.shape[0]
+    df = np.asarray(doc_term.sum(axis=0)).ravel()
+    return np.log((1 + n) / (1 + df)) + 1
+
+
+def score_batch(records, weighting=None):
+    """Score records against every category in one matrix product
+
+    Returns (scores, docker_ai) where scores is a (records x categories)
+    array in CATEGORIES order and docker_ai a boolean array telling which
+    records pass the Docker/AI gate.
+    """
+    categories = list(CATEGORIES)
+    doc_term = document_term_matrix([repository_text(record) for record in records])
+    gate = _term_category_matrix([DOCKER_GROUP, AI_ML_GROUP])
+    gate_hits = np.asarray(doc_term @ gate)
+    docker_ai = (gate_hits[:, 0] > 0) & (gate_hits[:, 1] > 0)
+
+    term_category = _term_category_matrix(categories)
+    if weighting == "idf":
+        term_category = term_category * idf_weights(doc_term)[:, None]
+    elif weighting is not None:
+        raise ValueError(f"Unknown weighting: {weighting}")
+    scores = np.asarray(doc_term @ term_category)
+    return scores, docker_ai
+
+
+def classify_batch(records, weighting=None):
+    """Return the best category for every record"""
+    records = list(records)
+    if not records:
+        return []
+    categories = list(CATEGORIES)
+    scores, _ = score_batch(records, weighting)
+    # argmax returns the first maximum, matching determine_category's tie-break
+    best = scores.argmax(axis=1)
+    has_match = scores.max(axis=1) > 0
+    return [categories[b] if matched else DEFAULT_CATEGORY
+            for b, matched in zip(best, has_match)]
+
+
+def load_records(path):
+    """Load records from a JSON Lines catalog or crawl dump, or a README.md list"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".md"):
+            return [{"name": entry.title, "description": entry.description, "topics": [],
+                     "url": entry.url, "section": entry.section}
+                    for entry in Catalog.from_markdown(f.read())]
+        records = []
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                record.setdefault("name", record.get("title", ""))
+                record.setdefault("description", "")
+                record["description"] = record["description"] or ""
+                record.setdefault("topics", [])
+                records.append(record)
+        return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reclassify list entries or crawl dumps in bulk")
+    parser.add_argument("paths", nargs="*", default=[CATALOG_FILE],
+                        help="JSON Lines catalogs or dumps, or README.md files (default: the catalog)")
+    parser.add_argument("--idf", action="store_true", help="Weight keywords by inverse document frequency")
+    args = parser.parse_args()
+
+    records = [record for path in args.paths for record in load_records(path)]
+    categories = classify_batch(records, "idf" if args.idf else None)
+    for record, category in zip(records, categories):
+        json.dump({"name": record["name"], "url": record.get("url"),
+                   "section": record.get("section"), "category": category}, sys.stdout)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Structured catalog of the awesome list
+
+Every entry of the list is one JSON record (section, title, description,
+type, link label and URL) in catalog.jsonl, one record per line, indexed in
+memory by section and by normalized URL. The catalog is the source of truth
+for the tables in README.md: the README is rendered from it in one streaming
+pass that copies the prose, headings and table headers as they are and
+writes each table's rows from the catalog. Only the sections that changed
+need re-rendering; the rows of the others are copied through untouched.
+
+Adding hundreds of entries is a dict insert each, then one linear render,
+instead of a search-and-splice rewrite of the whole file per entry.
+
+Usage:
+    python catalog.py import    # build ../catalog.jsonl from ../README.md
+    python catalog.py render    # rewrite ../README.md's tables from ../catalog.jsonl
+    python catalog.py check     # exit 1 if README.md is out of date
+    python catalog.py render --sort   # also sort every section by title
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from collections import namedtuple
+
+from readme_index import SEPARATOR_PATTERN, iter_table_rows, normalize_url
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+README_FILE = os.path.join(ROOT, "README.md")
+CATALOG_FILE = os.path.join(ROOT, "catalog.jsonl")
+
+Entry = namedtuple("Entry", ["section", "title", "description", "type", "label", "url"])
+
+LINK_CELL_PATTERN = re.compile(r"\[([^\]]*)\]\(([^)\s]+)\)")
+LINK_LABELS = {"Blog": "Read", "Video": "Watch"}  # Anything else is "View"
+
+
+def parse_cells(section, cells):
+    """Parse the cells of a table row of the list into an Entry, or None if it isn't one"""
+    if len(cells) < 4:
+        return None
+    link = LINK_CELL_PATTERN.fullmatch(cells[3])
+    label, url = (link.group(1), link.group(2)) if link else (cells[3], None)
+    return Entry(section, cells[0], cells[1], cells[2], label, url)
+
+
+def format_row(entry):
+    """Render an Entry as a Markdown table row"""
+    link = f"[{entry.label}]({entry.url})" if entry.url else entry.label
+    return f"| {entry.title} | {entry.description} | {entry.type} | {link} |"
+
+
+def link_label(entry_type):
+    """The link text the list uses for an entry type"""
+    return LINK_LABELS.get(entry_type, "View")
+
+
+def markdown_sections(readme_content):
+    """Return the "## " section names of a README, in order"""
+    return [line[3:].strip() for line in readme_content.split("\n") if line.startswith("## ")]
+
+
+class Catalog:
+    """Entries of the list, by section (in list order) and by normalized URL"""
+
+    def __init__(self, entries=()):
+        self.sections = {}
+        self._by_url = None  # Built on the first URL lookup; rendering never needs it
+        for entry in entries:
+            self.add(entry, dedupe=False)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.sections.values())
+
+    def __iter__(self):
+        for entries in self.sections.values():
+            yield from entries
+
+    @classmethod
+    def from_markdown(cls, readme_content):
+        """Build a catalog from the tables of a README"""
+        catalog = cls()
+        for section, _, cells in iter_table_rows(readme_content):
+            entry = parse_cells(section, cells)
+            if entry:
+                catalog.add(entry, dedupe=False)
+        return catalog
+
+    @classmethod
+    def loads(cls, text):
+        """Parse catalog JSON Lines"""
+        return cls(Entry(**json.loads(line)) for line in text.splitlines() if line.strip())
+
+    @classmethod
+    def load(cls, path=CATALOG_FILE):
+        with open(path, encoding="utf-8") as f:
+            return cls.loads(f.read())
+
+    def dumps(self):
+        """Serialize as JSON Lines, one entry per line in list order"""
+        return "".join(json.dumps(entry._asdict(), ensure_ascii=False) + "\n" for entry in self)
+
+    def save(self, path=CATALOG_FILE):
+        # Write then rename, so a crash mid-write never leaves half a catalog
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.dumps())
+        os.replace(temp_path, path)
+
+    @property
+    def by_url(self):
+        """Entries by normalized URL (the first entry, for a URL listed twice)"""
+        if self._by_url is None:
+            self._by_url = {}
+            for entry in self:
+                if entry.url:
+                    self._by_url.setdefault(normalize_url(entry.url), entry)
+        return self._by_url
+
+    def contains_url(self, url):
+        """Check if a URL is already in the catalog"""
+        return bool(url) and normalize_url(url) in self.by_url
+
+    def add(self, entry, dedupe=True):
+        """Add an entry at the end of its section; False if its URL is already listed"""
+        if dedupe and self.contains_url(entry.url):
+            return False
+        self.sections.setdefault(entry.section, []).append(entry)
+        if entry.url and self._by_url is not None:
+            self._by_url.setdefault(normalize_url(entry.url), entry)
+        return True
+
+    def sort(self, sections=None, key=lambda entry: entry.title.lower()):
+        """Sort the entries of some (default: all) sections"""
+        for section in sections or list(self.sections):
+            self.sections.get(section, []).sort(key=key)
+
+    def render_lines(self, lines, sections=None):
+        """Yield the README's lines with the catalog's rows in place of each table's rows
+
+        lines is any iterable of lines without their newlines. Only the tables
+        of the given sections (default: every catalog section) are rewritten.
+        """
+        pending = set(self.sections) if sections is None else set(sections)
+        section = None
+        header_rows = 0  # Header and separator rows seen in the current table
+        replacing = False  # Inside the rows of a table being re-rendered
+        for line in lines:
+            if line.startswith("## "):
+                section = line[3:].strip()
+                header_rows, replacing = 0, False
+            elif not line.startswith("|"):
+                header_rows, replacing = 0, False
+            elif replacing:
+                continue  # An old row, already replaced by the catalog's
+            elif section in pending and (header_rows == 0 or SEPARATOR_PATTERN.match(line.strip())):
+                header_rows += 1
+                if header_rows == 2:
+                    # Only the section's first table holds entries
+                    yield line
+                    yield from (format_row(entry) for entry in self.sections.get(section, []))
+                    pending.discard(section)
+                    replacing = True
+                    continue
+            yield line
+
+    def render(self, readme_content, sections=None):
+        """Return (README with the catalog's tables, sections the README has no table for)"""
+        wanted = list(self.sections) if sections is None else list(sections)
+        rendered = "\n".join(self.render_lines(readme_content.split("\n"), wanted))
+        present = set(markdown_sections(readme_content))
+        return rendered, [section for section in wanted if section not in present]
+
+
+def setup_argument_parser():
+    """Set up command line argument parser"""
+    parser = argparse.ArgumentParser(description="Keep README.md's tables in step with catalog.jsonl")
+    parser.add_argument("command", choices=["import", "render", "check"])
+    parser.add_argument("--readme", default=README_FILE, help="README to render into")
+    parser.add_argument("--catalog", default=CATALOG_FILE, help="Catalog of entries (JSON Lines)")
+    parser.add_argument("--sort", action="store_true", help="Sort every section by title when rendering")
+    return parser.parse_args()
+
+
+def main():
+    args = setup_argument_parser()
+    with open(args.readme, encoding="utf-8") as f:
+        readme_content = f.read()
+
+    if args.command == "import":
+        catalog = Catalog.from_markdown(readme_content)
+        catalog.save(args.catalog)
+        print(f"Wrote {len(catalog)} entries in {len(catalog.sections)} sections to {args.catalog}")
+        return
+
+    catalog = Catalog.load(args.catalog)
+    if args.sort:
+        catalog.sort()
+        catalog.save(args.catalog)
+    rendered, missing = catalog.render(readme_content)
+    for section in missing:
+        print(f"Warning: README has no section {section}; its entries are not rendered")
+
+    if args.command == "check":
+        if rendered != readme_content:
+            print(f"{args.readme} is out of date; run: python catalog.py render")
+            sys.exit(1)
+        print(f"{args.readme} matches {args.catalog}")
+        return
+
+    if rendered != readme_content:
+        temp_path = f"{args.readme}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(rendered)
+        os.replace(temp_path, args.readme)
+    print(f"Rendered {len(catalog)} entries into {args.readme}")
+
+
+if __name__ == "__main__":
+    main()
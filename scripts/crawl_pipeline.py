@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Streaming stages of the crawler
+
+A crawl is a chain of generators, search -> skip known -> suppress clones ->
+enrich -> classify, that the caller consumes one candidate at a time. Search
+results are reduced to compact Candidate records as soon as they arrive, and
+the search threads hand them over through a bounded queue, so however many
+results a crawl turns up only a bounded number are in flight (plus the ids
+already yielded, to drop repeats across queries). Stages that need batches
+for their API calls (GraphQL lookups, content signals, near-duplicate
+clustering) take them in fixed-size slices, so later stages start on the
+first batch while searching is still under way.
+
+Stages only depend on what they are given (a search function, a classifier,
+a state or index object), so benchmarks and other tools can chain them over
+synthetic candidates too.
+"""
+
+import queue
+import threading
+import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import NamedTuple, Optional
+
+from crawl_state import DUPLICATE
+from metrics import REGISTRY
+from near_duplicates import index_item, suppress_near_duplicates
+
+BATCH_SIZE = 100
+QUEUE_SIZE = 1000
+
+
+class Candidate(NamedTuple):
+    """The few fields of a repository the crawler needs, instead of its whole payload
+
+    Field lookups also work by name (candidate["stars"], candidate.get("signals")),
+    so helpers written for plain dicts take a Candidate as is.
+    """
+    id: int
+    name: str
+    full_name: str
+    owner: str
+    description: str
+    url: str
+    stars: int
+    updated_at: str
+    pushed_at: Optional[str]
+    topics: tuple = ()
+    fork: bool = False
+    mirror: bool = False
+    query: Optional[str] = None  # The search query that found it first
+    signals: Optional[dict] = None
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            return tuple.__getitem__(self, key)
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        value = getattr(self, key) if key in self._fields else None
+        return default if value is None else value
+
+    @classmethod
+    def from_search(cls, item, query=None):
+        """Build a candidate from a REST repository (search result) payload"""
+        return cls(
+            id=item["id"],
+            name=item["name"],
+            full_name=item["full_name"],
+            owner=item["owner"]["login"],
+            description=item["description"] or "",
+            url=item["html_url"],
+            stars=item["stargazers_count"],
+            updated_at=item["updated_at"],
+            pushed_at=item.get("pushed_at"),
+            topics=tuple(item.get("topics", ())),
+            fork=item.get("fork", False),
+            mirror=bool(item.get("mirror_url")),
+            query=query,
+        )
+
+    @classmethod
+    def from_graphql(cls, node, query=None):
+        """Build a candidate from a GraphQL Repository node"""
+        return cls(
+            id=node["databaseId"],
+            name=node["name"],
+            full_name=node["nameWithOwner"],
+            owner=node["owner"]["login"],
+            description=node["description"] or "",
+            url=node["url"],
+            stars=node["stargazerCount"],
+            updated_at=node["updatedAt"],
+            pushed_at=node["pushedAt"],
+            topics=tuple(t["topic"]["name"] for t in node["repositoryTopics"]["nodes"]),
+            fork=node.get("isFork", False),
+            mirror=node.get("isMirror", False),
+            query=query,
+        )
+
+
+def batched(iterable, size):
+    """Yield successive lists of up to size items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def count_outcome(candidate, outcome):
+    """Count what happened to a candidate against the query that found it"""
+    REGISTRY.inc("crawler_candidates", query=candidate.query, outcome=outcome)
+
+
+class SearchStats:
+    """What each query returned, for deciding which high-water marks may advance"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.results = Counter()
+        self.failed = set()
+        self.truncated = set()  # Queries that left results unread
+        self.unique = 0
+
+    def found(self, query):
+        with self._lock:
+            self.results[query] += 1
+
+    def fail(self, query):
+        with self._lock:
+            self.failed.add(query)
+
+    def truncate(self, query):
+        with self._lock:
+            self.truncated.add(query)
+
+
+def search_stage(queries, search, max_workers=8, stats=None, buffer=QUEUE_SIZE):
+    """Run every query concurrently, yielding each repository once as results arrive
+
+    search(query) returns an iterable of REST repository payloads. A query
+    that raises a RequestException is reported, recorded in stats.failed and
+    keeps the results it had already produced.
+    """
+    stats = stats or SearchStats()
+    results = queue.Queue(maxsize=buffer)
+    stop = threading.Event()
+    done = object()
+
+    def put(value):
+        # Give up if the consumer went away instead of blocking on a full queue
+        while not stop.is_set():
+            try:
+                results.put(value, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(query):
+        try:
+            with REGISTRY.timer("search"):
+                for item in search(query):
+                    stats.found(query)
+                    if not put(Candidate.from_search(item, query)):
+                        return
+        except requests.RequestException as e:
+            print(f"GitHub API error: {e}")
+            stats.fail(query)
+        except Exception as e:
+            # Anything else is a bug; hand it to the consumer to re-raise
+            put(e)
+        finally:
+            put(done)
+
+    queries = list(queries)
+    seen = set()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries) or 1)))
+    try:
+        for query in queries:
+            executor.submit(run, query)
+        remaining = len(queries)
+        while remaining:
+            candidate = results.get()
+            if candidate is done:
+                remaining -= 1
+                continue
+            if isinstance(candidate, Exception):
+                raise candidate
+            REGISTRY.inc("crawler_search_results", query=candidate.query)
+            if candidate.id in seen:
+                continue
+            seen.add(candidate.id)
+            stats.unique += 1
+            yield candidate
+    finally:
+        stop.set()
+        executor.shutdown(wait=True)
+
+
+def skip_known(candidates, state=None, index=None, dedup=None):
+    """Drop candidates classified before and not pushed since, and those already listed
+
+    Listed candidates are added to the dedup index, if given, on the way out,
+    so suppress_clones also catches clones of projects the list already has.
+    """
+    for candidate in candidates:
+        if state is not None and state.is_unchanged(candidate.id, candidate.pushed_at):
+            count_outcome(candidate, "seen")
+        elif index is not None and index.contains_url(candidate.url):
+            count_outcome(candidate, "listed")
+            if dedup is not None:
+                index_item(candidate, dedup)
+        else:
+            yield candidate
+
+
+def suppress_clones(candidates, dedup, state=None, batch_size=BATCH_SIZE * 5):
+    """Drop forks, mirrors and near-duplicates of a more-starred candidate
+
+    Each batch is clustered most-starred first against everything indexed so
+    far (see near_duplicates.py), so the most-starred copy wins within a
+    batch; a more-starred copy arriving in a later batch is kept as well.
+    Kept candidates are indexed for this run only: the caller persists the
+    ones it proposes. Only a duplicate of a persisted (listed or proposed)
+    copy is recorded in the state, so the others are looked at again later.
+    """
+    for batch in batched(candidates, batch_size):
+        originals = []
+        for candidate in batch:
+            if candidate.fork or candidate.mirror:
+                count_outcome(candidate, "fork")
+            else:
+                originals.append(candidate)
+        with REGISTRY.timer("dedup"):
+            _, duplicates = suppress_near_duplicates(originals, dedup, persist=False)
+        suppressed = set()
+        for candidate, _, canonical_key in duplicates:
+            count_outcome(candidate, "duplicate")
+            if state is not None and dedup.is_persisted(canonical_key):
+                state.record(candidate.id, candidate.full_name, candidate.pushed_at, DUPLICATE)
+            suppressed.add(candidate.id)
+        REGISTRY.inc("crawler_duplicates", len(duplicates))
+        yield from (candidate for candidate in originals if candidate.id not in suppressed)
+
+
+def map_batches(candidates, transform, batch_size=BATCH_SIZE, phase=None):
+    """Pass candidates through transform(batch) -> candidates, one batch at a time"""
+    for batch in batched(candidates, batch_size):
+        if phase:
+            with REGISTRY.timer(phase):
+                batch = list(transform(batch))
+        else:
+            batch = list(transform(batch))
+        yield from batch
+
+
+def classify_stage(candidates, classify):
+    """Yield (candidate, accepted, category scores) using classify(candidate)"""
+    for candidate in candidates:
+        with REGISTRY.timer("classify"):
+            accepted, scores = classify(candidate)
+        count_outcome(candidate, "accepted" if accepted else "rejected")
+        yield candidate, accepted, scores
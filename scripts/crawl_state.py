@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Incremental crawl state for the GitHub crawler
+
+Persists, in a small SQLite file, a high-water mark per search query (the
+start time of the last run that consumed that query's results completely)
+and every repository the crawler has classified, keyed by GitHub repo ID with
+the pushed_at it had at the time. Later runs only search past the high-water
+mark and skip repositories that have not been pushed to since they were seen,
+so a run costs O(new or changed) rather than O(everything in the window).
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+REJECTED = "rejected"
+PROPOSED = "proposed"
+DUPLICATE = "duplicate"
+
+
+def parse_timestamp(value):
+    """Parse a GitHub ISO 8601 timestamp into an aware datetime"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def format_timestamp(value):
+    """Format an aware datetime the way GitHub search qualifiers expect"""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class CrawlState:
+    """SQLite-backed high-water marks and seen-set of classified repositories
+
+    Safe to share across threads: search threads check the seen-set while
+    the main thread records classifications.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS queries ("
+            " query TEXT PRIMARY KEY,"
+            " high_water TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS repos ("
+            " id INTEGER PRIMARY KEY,"
+            " full_name TEXT NOT NULL,"
+            " pushed_at TEXT,"
+            " status TEXT NOT NULL,"
+            " seen_at TEXT NOT NULL);"
+        )
+        self._db.commit()
+
+    def high_water(self, query):
+        """Return the high-water mark for a query, or None if never completed"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT high_water FROM queries WHERE query = ?", (query,)).fetchone()
+        return parse_timestamp(row[0]) if row else None
+
+    def set_high_water(self, query, value):
+        """Advance a query's high-water mark (applied on commit)"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO queries VALUES (?, ?)", (query, format_timestamp(value)))
+
+    def is_unchanged(self, repo_id, pushed_at):
+        """Check if a repository was already classified at this pushed_at"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT pushed_at FROM repos WHERE id = ?", (repo_id,)).fetchone()
+        return row is not None and row[0] == pushed_at
+
+    def classified(self):
+        """Return {repo ID: pushed_at} of every repository classified so far"""
+        with self._lock:
+            return dict(self._db.execute("SELECT id, pushed_at FROM repos"))
+
+    def status(self, repo_id):
+        """Return the recorded status of a repository, or None if unseen"""
+        with self._lock:
+            row = self._db.execute("SELECT status FROM repos WHERE id = ?", (repo_id,)).fetchone()
+        return row[0] if row else None
+
+    def record(self, repo_id, full_name, pushed_at, status):
+        """Remember how a repository was classified (applied on commit)"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, ?)",
+                (repo_id, full_name, pushed_at, status,
+                 format_timestamp(datetime.now(timezone.utc)))
+            )
+
+    def commit(self):
+        """Persist everything recorded during a successful run"""
+        with self._lock:
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
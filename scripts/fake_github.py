@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+Local GitHub API stand-in for load-testing the crawler
+
+Serves the subset of the GitHub REST and GraphQL APIs used by
+github_crawler.py and the tweet scheduler's get_readme_content (search,
+repos, topics, contents, readme, branches, git blobs/trees/commits/refs,
+pulls, rate_limit, graphql) from memory. Repositories can be synthesized in bulk or
+replayed from a recorded cassette, and rate limiting is emulated with the real
+X-RateLimit-* headers, 403s on an exhausted budget and secondary-limit 403s
+with Retry-After, so throughput and backoff can be measured without spending
+real quota or creating real branches and PRs.
+
+Usage:
+python fake_github.py --repos 10000 --readme ../README.md
+GITHUB_TOKEN=fake python github_crawler.py --api-url http://127.0.0.1:8765 --limit 300
+
+# Record real responses to a cassette, then replay them offline
+python fake_github.py --record cassette.json --upstream https://api.github.com
+python fake_github.py --cassette cassette.json
+"""
+
+import re
+import sys
+import json
+import time
+import base64
+import random
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+OWNER = "ajeetraina"
+NAME = "awesome-docker-ai-lists"
+SEARCH_RESULT_CAP = 1000
+
+VOCABULARY = [
+    "docker", "ai", "ml", "llm", "machine learning", "deep learning", "neural network",
+    "containerized", "model serving", "chatbot", "agent", "mcp", "health", "security",
+    "monitoring", "education", "nlp", "huggingface", "gpu", "inference", "pipeline",
+    "compose", "kubernetes", "dashboard", "api", "rag", "vector", "notebook",
+]
+TOPICS = ["docker", "ai", "machine-learning", "llm", "deep-learning", "mcp", "genai",
+          "huggingface", "kubernetes", "python", "chatbot", "mlops"]
+
+
+def git_sha(kind, data):
+    """Hash content the way git does, so blob SHAs match real ones"""
+    return hashlib.sha1(f"{kind} {len(data)}\0".encode() + data).hexdigest()
+
+
+def iso(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_date(value):
+    if "T" not in value:
+        value += "T00:00:00Z"
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def synthesize_repos(count, days, seed=42):
+    """Generate count repository payloads pushed within the last days"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    repos = []
+    for i in range(count):
+        owner = f"user{rng.randrange(count // 3 + 1)}"
+        words = rng.sample(VOCABULARY, 4)
+        name = "-".join(w.split()[0] for w in words[:2]) + f"-{i}"
+        pushed = now - timedelta(seconds=rng.randrange(days * 86400))
+        repos.append({
+            "id": 100000 + i,
+            "name": name,
+            "full_name": f"{owner}/{name}",
+            "owner": {"login": owner},
+            "html_url": f"https://github.com/{owner}/{name}",
+            "description": f"A {words[0]} project using {words[1]}, {words[2]} and {words[3]}",
+            "fork": rng.random() < 0.05,
+            "stargazers_count": int(rng.paretovariate(1.2)) - 1,
+            "created_at": iso(pushed - timedelta(days=rng.randrange(1, 365))),
+            "updated_at": iso(pushed),
+            "pushed_at": iso(pushed),
+            "default_branch": "main",
+            "topics": rng.sample(TOPICS, rng.randrange(0, 5)),
+        })
+    return repos
+
+
+class RateLimits:
+    """Per-resource budgets that reset every window, like GitHub's"""
+
+    def __init__(self, limits, window, secondary_every=0, retry_after=1):
+        self.limits = limits
+        self.window = window
+        self.secondary_every = secondary_every
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._used = {}
+        self._reset = {}
+        self._requests = 0
+
+    def charge(self, resource):
+        """Charge one request, returning (status or None, headers)"""
+        with self._lock:
+            now = time.time()
+            if now >= self._reset.get(resource, 0):
+                self._reset[resource] = now + self.window
+                self._used[resource] = 0
+            self._requests += 1
+            limit = self.limits[resource]
+            headers = {
+                "X-RateLimit-Limit": str(limit),
+                "X-RateLimit-Reset": str(int(self._reset[resource])),
+                "X-RateLimit-Resource": resource,
+            }
+            if self.secondary_every and self._requests % self.secondary_every == 0:
+                headers["X-RateLimit-Remaining"] = str(limit - self._used[resource])
+                headers["Retry-After"] = str(self.retry_after)
+                return 403, headers
+            if self._used[resource] >= limit:
+                headers["X-RateLimit-Remaining"] = "0"
+                return 403, headers
+            self._used[resource] += 1
+            headers["X-RateLimit-Used"] = str(self._used[resource])
+            headers["X-RateLimit-Remaining"] = str(limit - self._used[resource])
+            return None, headers
+
+    def refund(self, resource):
+        """Give back a charge, e.g. for a 304 (GitHub doesn't count those)"""
+        with self._lock:
+            self._used[resource] = max(0, self._used.get(resource, 0) - 1)
+
+    def status(self):
+        with self._lock:
+            return {resource: {"limit": limit,
+                               "used": self._used.get(resource, 0),
+                               "remaining": limit - self._used.get(resource, 0),
+                               "reset": int(self._reset.get(resource, time.time()))}
+                    for resource, limit in self.limits.items()}
+
+
+class FakeGitHub:
+    """In-memory repositories, git objects and pull requests"""
+
+    def __init__(self, repos, readme, cassette=None, catalog=None):
+        self.lock = threading.Lock()
+        self.repos = {repo["full_name"].lower(): repo for repo in repos}
+        self.by_pushed = sorted(repos, key=lambda repo: repo["pushed_at"], reverse=True)
+        self.cassette = {}
+        for interaction in (cassette or {}).get("interactions", []):
+            self.cassette[(interaction["method"], interaction["path"])] = interaction
+        self.blobs = {}
+        self.trees = {}
+        self.commits = {}
+        self.refs = {}
+        self.pulls = []
+
+        files = {"README.md": self.create_blob(readme.encode("utf-8"))}
+        if catalog is not None:
+            files["catalog.jsonl"] = self.create_blob(catalog.encode("utf-8"))
+        tree = self.create_tree(files)
+        self.refs["refs/heads/main"] = self.create_commit("Initial commit", tree, [])
+        self.list_repo = {
+            "id": 1, "name": NAME, "full_name": f"{OWNER}/{NAME}",
+            "owner": {"login": OWNER}, "html_url": f"https://github.com/{OWNER}/{NAME}",
+            "description": "Awesome Docker AI/ML lists", "default_branch": "main",
+            "stargazers_count": 0, "topics": [],
+        }
+
+    def create_blob(self, data):
+        sha = git_sha("blob", data)
+        self.blobs[sha] = data
+        return sha
+
+    def create_tree(self, entries):
+        sha = git_sha("tree", json.dumps(entries, sort_keys=True).encode())
+        self.trees[sha] = dict(entries)
+        return sha
+
+    def create_commit(self, message, tree, parents):
+        sha = git_sha("commit", json.dumps([message, tree, parents, time.time()]).encode())
+        self.commits[sha] = {"message": message, "tree": tree, "parents": parents}
+        return sha
+
+    def repo_content(self, repo):
+        """Root file names and README of a synthesized repository, derived from its name"""
+        digest = int(hashlib.sha1(repo["full_name"].encode()).hexdigest(), 16)
+        files = ["LICENSE", "README.md"]
+        if digest % 10 < 6:
+            files.append("Dockerfile")
+        if digest % 10 < 3:
+            files.append("docker-compose.yml")
+        readme = f"# {repo['name']}\n\n{repo['description']}\n"
+        if "Dockerfile" in files:
+            readme += "\n## Run it\n\n    docker build -t app . && docker run app\n"
+        return sorted(files), readme
+
+    def resolve(self, ref):
+        """Resolve a branch name or commit SHA to a commit SHA"""
+        if ref in self.commits:
+            return ref
+        return self.refs.get(f"refs/heads/{ref}")
+
+    def search(self, query):
+        """Filter repositories by the free-text words and qualifiers of a query"""
+        words = []
+        pushed = (None, None)
+        stars = (None, None)
+        fork = "false"
+        for token in query.split():
+            if ":" not in token:
+                words.append(token.lower())
+                continue
+            key, value = token.split(":", 1)
+            low, high = self._range(value)
+            if key == "pushed":
+                pushed = (low and parse_date(low), high and parse_date(high))
+            elif key == "stars":
+                stars = (low and int(low), high and int(high))
+            elif key == "fork":
+                fork = value
+
+        results = []
+        for repo in self.by_pushed:
+            if fork == "false" and repo["fork"]:
+                continue
+            pushed_at = parse_date(repo["pushed_at"])
+            if (pushed[0] and pushed_at <= pushed[0]) or (pushed[1] and pushed_at > pushed[1]):
+                continue
+            count = repo["stargazers_count"]
+            if (stars[0] is not None and count < stars[0]) or \
+                    (stars[1] is not None and count > stars[1]):
+                continue
+            text = " ".join([repo["name"], repo["description"] or ""] + repo["topics"]).lower()
+            if all(word in text for word in words):
+                results.append(repo)
+        return results
+
+    @staticmethod
+    def _range(value):
+        """Parse >x, >=x, <x, <=x and x..y qualifier values into (low, high)"""
+        if ".." in value:
+            low, high = value.split("..", 1)
+            return (None if low == "*" else low), (None if high == "*" else high)
+        match = re.match(r"([<>]=?)(.*)", value)
+        if not match:
+            return value, value
+        op, operand = match.groups()
+        return (operand, None) if op.startswith(">") else (None, operand)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    github = None
+    limits = None
+    upstream = None
+    recording = None
+
+    routes = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def dispatch(self, method):
+        parts = urlsplit(self.path)
+        self.query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        path = parts.path.rstrip("/") or "/"
+        # Clients configured with a GitHub Enterprise style base URL send /api/v3
+        if path.startswith("/api/v3"):
+            path = path[len("/api/v3"):] or "/"
+
+        if self.recording is not None:
+            return self.proxy(method, path, parts.query)
+
+        interaction = self.github.cassette.get((method, self.path))
+        if interaction:
+            return self.send_json(interaction["status"], interaction["body"],
+                                  interaction.get("headers", {}))
+
+        resource = "search" if path.startswith("/search/") else \
+            "graphql" if path == "/graphql" else "core"
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                if path == "/rate_limit":
+                    return handler(self, *match.groups())
+                status, headers = self.limits.charge(resource)
+                if status:
+                    return self.send_json(status, {
+                        "message": "You have exceeded a secondary rate limit"
+                        if "Retry-After" in headers else "API rate limit exceeded",
+                    }, headers)
+                self.rate_headers = headers
+                with self.github.lock:
+                    return handler(self, *match.groups())
+        self.send_json(404, {"message": "Not Found"})
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in {**getattr(self, "rate_headers", {}), **(headers or {})}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def proxy(self, method, path, query):
+        """Forward to the real API and append the exchange to the cassette"""
+        import requests
+        url = self.upstream.rstrip("/") + path + (f"?{query}" if query else "")
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() in ("authorization", "accept")}
+        response = requests.request(method, url, headers=headers,
+                                    json=self.body or None, timeout=30)
+        body = response.json() if response.content else {}
+        kept = {name: value for name, value in response.headers.items()
+                if name.lower().startswith("x-ratelimit") or name.lower() in ("etag", "link")}
+        with self.github.lock:
+            self.recording["interactions"].append({
+                "method": method, "path": self.path, "status": response.status_code,
+                "headers": kept, "body": body,
+            })
+        self.send_json(response.status_code, body, kept)
+
+    # -- REST endpoints ---------------------------------------------------
+
+    def search_repositories(self):
+        results = self.github.search(self.query.get("q", ""))
+        per_page = min(int(self.query.get("per_page", 30)), 100)
+        page = int(self.query.get("page", 1))
+        start = (page - 1) * per_page
+        if start >= SEARCH_RESULT_CAP:
+            return self.send_json(422, {"message": "Only the first 1000 search results are available"})
+        end = min(start + per_page, SEARCH_RESULT_CAP)
+        self.send_json(200, {"total_count": len(results), "incomplete_results": False,
+                             "items": results[start:end]})
+
+    def get_repo(self, owner, name):
+        full_name = f"{owner}/{name}".lower()
+        if full_name == f"{OWNER}/{NAME}".lower():
+            # PyGithub builds follow-up URLs from the repository's url
+            url = f"http://{self.headers['Host']}/repos/{OWNER}/{NAME}"
+            return self.send_json(200, dict(self.github.list_repo, url=url))
+        repo = self.github.repos.get(full_name)
+        if not repo:
+            return self.send_json(404, {"message": "Not Found"})
+        self.send_json(200, repo)
+
+    def get_topics(self, owner, name):
+        repo = self.github.repos.get(f"{owner}/{name}".lower())
+        if not repo:
+            return self.send_json(404, {"message": "Not Found"})
+        self.send_json(200, {"names": repo["topics"]})
+
+    def get_contents(self, owner, name, path):
+        commit = self.github.resolve(self.query.get("ref", "main"))
+        blob = commit and self.github.trees[self.github.commits[commit]["tree"]].get(path)
+        if not blob:
+            return self.send_json(404, {"message": "Not Found"})
+        etag = f'"{blob}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.limits.refund("core")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = self.github.blobs[blob]
+        self.send_json(200, {
+            "type": "file", "encoding": "base64", "name": path.rsplit("/", 1)[-1],
+            "path": path, "sha": blob, "size": len(data),
+            "content": base64.b64encode(data).decode("ascii"),
+        }, {"ETag": etag})
+
+    def list_root(self, owner, name):
+        if f"{owner}/{name}".lower() == f"{OWNER}/{NAME}".lower():
+            commit = self.github.resolve(self.query.get("ref", "main"))
+            files = sorted(self.github.trees[self.github.commits[commit]["tree"]])
+        else:
+            repo = self.github.repos.get(f"{owner}/{name}".lower())
+            if not repo:
+                return self.send_json(404, {"message": "Not Found"})
+            files, _ = self.github.repo_content(repo)
+        self.send_json(200, [{"name": f, "path": f, "type": "file"} for f in files])
+
+    def get_readme(self, owner, name):
+        if f"{owner}/{name}".lower() == f"{OWNER}/{NAME}".lower():
+            commit = self.github.resolve("main")
+            data = self.github.blobs[self.github.trees[self.github.commits[commit]["tree"]]["README.md"]]
+        else:
+            repo = self.github.repos.get(f"{owner}/{name}".lower())
+            if not repo:
+                return self.send_json(404, {"message": "Not Found"})
+            data = self.github.repo_content(repo)[1].encode("utf-8")
+        sha = git_sha("blob", data)
+        etag = f'"{sha}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.limits.refund("core")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if "raw" not in self.headers.get("Accept", ""):
+            return self.send_json(200, {
+                "type": "file", "encoding": "base64", "name": "README.md", "path": "README.md",
+                "sha": sha, "size": len(data), "content": base64.b64encode(data).decode("ascii"),
+            }, {"ETag": etag})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        for header, value in self.rate_headers.items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def put_contents(self, owner, name, path):
+        branch = self.body.get("branch", "main")
+        parent = self.github.resolve(branch)
+        tree = dict(self.github.trees[self.github.commits[parent]["tree"]])
+        tree[path] = self.github.create_blob(base64.b64decode(self.body["content"]))
+        commit = self.github.create_commit(self.body["message"],
+                                           self.github.create_tree(tree), [parent])
+        self.github.refs[f"refs/heads/{branch}"] = commit
+        self.send_json(200, {"content": {"path": path, "sha": tree[path]},
+                             "commit": {"sha": commit}})
+
+    def get_branch(self, owner, name, branch):
+        commit = self.github.resolve(branch)
+        if not commit:
+            return self.send_json(404, {"message": "Branch not found"})
+        self.send_json(200, {"name": branch, "commit": {"sha": commit}})
+
+    def get_commit(self, owner, name, sha):
+        commit = self.github.commits.get(sha)
+        if not commit:
+            return self.send_json(404, {"message": "Not Found"})
+        self.send_json(200, self.commit_payload(sha))
+
+    def commit_payload(self, sha):
+        commit = self.github.commits[sha]
+        return {"sha": sha, "message": commit["message"],
+                "tree": {"sha": commit["tree"]},
+                "parents": [{"sha": parent} for parent in commit["parents"]]}
+
+    def create_blob(self, owner, name):
+        content = self.body["content"]
+        data = base64.b64decode(content) if self.body.get("encoding") == "base64" \
+            else content.encode("utf-8")
+        self.send_json(201, {"sha": self.github.create_blob(data)})
+
+    def create_tree(self, owner, name):
+        base = self.body.get("base_tree")
+        entries = dict(self.github.trees.get(base, {}))
+        for entry in self.body["tree"]:
+            entries[entry["path"]] = entry["sha"]
+        sha = self.github.create_tree(entries)
+        self.send_json(201, {"sha": sha, "tree": [
+            {"path": path, "mode": "100644", "type": "blob", "sha": blob}
+            for path, blob in entries.items()]})
+
+    def create_commit(self, owner, name):
+        sha = self.github.create_commit(self.body["message"], self.body["tree"],
+                                        self.body.get("parents", []))
+        self.send_json(201, self.commit_payload(sha))
+
+    def create_ref(self, owner, name):
+        ref = self.body["ref"]
+        if ref in self.github.refs:
+            return self.send_json(422, {"message": "Reference already exists"})
+        self.github.refs[ref] = self.body["sha"]
+        self.send_json(201, {"ref": ref, "object": {"sha": self.body["sha"], "type": "commit"}})
+
+    def create_pull(self, owner, name):
+        number = len(self.github.pulls) + 1
+        pull = {"number": number, "state": "open", "title": self.body["title"],
+                "body": self.body.get("body"), "head": {"ref": self.body["head"]},
+                "base": {"ref": self.body["base"]},
+                "html_url": f"https://github.com/{owner}/{name}/pull/{number}"}
+        self.github.pulls.append(pull)
+        self.send_json(201, pull)
+
+    def list_pulls(self, owner, name):
+        self.send_json(200, self.github.pulls)
+
+    def rate_limit(self):
+        resources = self.limits.status()
+        self.send_json(200, {"resources": resources, "rate": resources["core"]})
+
+    # -- GraphQL ----------------------------------------------------------
+
+    def graphql(self):
+        variables = self.body.get("variables", {})
+        data = {}
+        for key, owner in variables.items():
+            if not key.startswith("o"):
+                continue
+            i = key[1:]
+            repo = self.github.repos.get(f"{owner}/{variables.get('n' + i)}".lower())
+            data[f"r{i}"] = repo and {
+                "databaseId": repo["id"],
+                "name": repo["name"],
+                "nameWithOwner": repo["full_name"],
+                "owner": {"login": repo["owner"]["login"]},
+                "description": repo["description"],
+                "url": repo["html_url"],
+                "stargazerCount": repo["stargazers_count"],
+                "updatedAt": repo["updated_at"],
+                "pushedAt": repo["pushed_at"],
+                "isFork": repo["fork"],
+                "repositoryTopics": {"nodes": [{"topic": {"name": topic}}
+                                               for topic in repo["topics"]]},
+            }
+        self.send_json(200, {"data": data})
+
+
+_REPO = r"/repos/([^/]+)/([^/]+)"
+Handler.routes = [
+    ("GET", re.compile(r"/search/repositories"), Handler.search_repositories),
+    ("GET", re.compile(_REPO), Handler.get_repo),
+    ("GET", re.compile(_REPO + r"/topics"), Handler.get_topics),
+    ("GET", re.compile(_REPO + r"/contents"), Handler.list_root),
+    ("GET", re.compile(_REPO + r"/contents/(.+)"), Handler.get_contents),
+    ("GET", re.compile(_REPO + r"/readme"), Handler.get_readme),
+    ("PUT", re.compile(_REPO + r"/contents/(.+)"), Handler.put_contents),
+    ("GET", re.compile(_REPO + r"/branches/(.+)"), Handler.get_branch),
+    ("GET", re.compile(_REPO + r"/git/commits/([0-9a-f]+)"), Handler.get_commit),
+    ("POST", re.compile(_REPO + r"/git/blobs"), Handler.create_blob),
+    ("POST", re.compile(_REPO + r"/git/trees"), Handler.create_tree),
+    ("POST", re.compile(_REPO + r"/git/commits"), Handler.create_commit),
+    ("POST", re.compile(_REPO + r"/git/refs"), Handler.create_ref),
+    ("POST", re.compile(_REPO + r"/pulls"), Handler.create_pull),
+    ("GET", re.compile(_REPO + r"/pulls"), Handler.list_pulls),
+    ("GET", re.compile(r"/rate_limit"), Handler.rate_limit),
+    ("POST", re.compile(r"/graphql"), Handler.graphql),
+]
+
+
+def make_server(repos=(), readme="# Awesome list\n", host="127.0.0.1", port=8765,
+                limits=None, cassette=None, upstream=None, recording=None, catalog=None):
+    """Build (but don't start) a fake GitHub server; port 0 picks a free port"""
+    handler = type("BoundHandler", (Handler,), {
+        "github": FakeGitHub(list(repos), readme, cassette, catalog),
+        "limits": limits or RateLimits({"core": 5000, "search": 30, "graphql": 5000}, 60),
+        "upstream": upstream,
+        "recording": recording,
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GitHub API stand-in for load-testing the crawler")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repos", type=int, default=1000, help="Number of repositories to synthesize")
+    parser.add_argument("--days", type=int, default=30, help="Spread synthetic pushes over this many days")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--readme", help="README.md served as the list's contents")
+    parser.add_argument("--catalog", help="catalog.jsonl served next to the README (none if omitted)")
+    parser.add_argument("--cassette", help="Replay recorded responses from this JSON file")
+    parser.add_argument("--record", help="Proxy to --upstream and record responses to this JSON file")
+    parser.add_argument("--upstream", default="https://api.github.com")
+    parser.add_argument("--core-limit", type=int, default=5000)
+    parser.add_argument("--search-limit", type=int, default=30)
+    parser.add_argument("--graphql-limit", type=int, default=5000)
+    parser.add_argument("--window", type=float, default=60, help="Seconds until budgets reset")
+    parser.add_argument("--secondary-every", type=int, default=0,
+                        help="Answer every Nth request with a secondary-limit 403 (0: never)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After sent with secondary limits")
+    args = parser.parse_args()
+
+    readme = "# Awesome list\n"
+    if args.readme:
+        with open(args.readme, encoding="utf-8") as f:
+            readme = f.read()
+    catalog = None
+    if args.catalog:
+        with open(args.catalog, encoding="utf-8") as f:
+            catalog = f.read()
+    cassette = None
+    if args.cassette:
+        with open(args.cassette) as f:
+            cassette = json.load(f)
+    recording = {"interactions": []} if args.record else None
+
+    limits = RateLimits({"core": args.core_limit, "search": args.search_limit,
+                         "graphql": args.graphql_limit}, args.window,
+                        args.secondary_every, args.retry_after)
+    server = make_server(synthesize_repos(args.repos, args.days, args.seed), readme,
+                         args.host, args.port, limits, cassette, args.upstream, recording, catalog)
+    print(f"Fake GitHub API listening on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if recording is not None:
+            with open(args.record, "w") as f:
+                json.dump(recording, f, indent=2)
+            print(f"Recorded {len(recording['interactions'])} interactions to {args.record}",
+                  file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Minimal GitHub REST client for the crawler
+
+Wraps a pooled requests.Session and throttles every call on the rate-limit
+headers GitHub returns (X-RateLimit-Remaining / X-RateLimit-Reset) and on the
+Retry-After header sent with secondary rate limits, so callers can issue
+requests from many threads without sleeping a fixed amount between them.
+"""
+
+import time
+import threading
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+from metrics import REGISTRY
+
+API_URL = "https://api.github.com"
+POOL_SIZE = 32
+MAX_PER_PAGE = 100
+SEARCH_RESULT_CAP = 1000  # GitHub never returns more than this per search
+PROBE_TIMEOUT = 30  # Seconds to hold other callers while the budget is unknown
+RESET_MARGIN = 1  # X-RateLimit-Reset is whole seconds and clocks drift
+
+
+def resource_for_path(path):
+    """Return the rate-limit bucket GitHub charges a request path against"""
+    if path.startswith("/search/"):
+        return "search"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "core"
+
+
+def endpoint_for_path(path):
+    """Reduce a request path to its endpoint, e.g. /repos/{owner}/{repo}/topics
+
+    Keeps metric labels few no matter how many repositories are touched.
+    """
+    parts = urlsplit(path).path.strip("/").split("/")
+    if parts[0] == "repos" and len(parts) >= 3:
+        # /repos/o/r/git/refs/heads/x -> /repos/{owner}/{repo}/git/refs
+        rest = parts[3:5] if parts[3:4] == ["git"] else parts[3:4]
+        parts = ["repos", "{owner}", "{repo}"] + rest
+    else:
+        parts = parts[:2]
+    return "/" + "/".join(parts)
+
+
+class RateLimiter:
+    """Thread-safe throttle fed by GitHub's rate-limit response headers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._remaining = {}
+        self._reset_at = {}
+        self._probing = {}
+        self._blocked_until = 0.0
+
+    def wait(self, resource):
+        """Block until a request against the given bucket is allowed"""
+        while True:
+            with self._lock:
+                now = time.time()
+                delay = self._blocked_until - now
+                remaining = self._remaining.get(resource)
+                if delay <= 0 and remaining is not None and remaining <= 0:
+                    delay = self._reset_at.get(resource, now - RESET_MARGIN) + RESET_MARGIN - now
+                    if delay <= 0:
+                        # The window has rolled over; the next response resyncs us
+                        self._remaining.pop(resource, None)
+                        remaining = None
+                if delay <= 0 and remaining is None:
+                    # Budget unknown: let one request through to learn it rather
+                    # than have every waiting thread stampede the fresh window
+                    if now - self._probing.get(resource, 0) < PROBE_TIMEOUT:
+                        delay = 0.05
+                    else:
+                        self._probing[resource] = now
+                        return
+                if delay <= 0:
+                    # Reserve a slot so concurrent callers don't overshoot the budget
+                    if remaining is not None:
+                        self._remaining[resource] = remaining - 1
+                    return
+            pause = min(delay, 60) + 0.1
+            REGISTRY.observe("github_rate_limit_wait_seconds", pause, resource=resource)
+            time.sleep(pause)
+
+    def release(self, resource):
+        """Give up a probe whose request failed before any response arrived"""
+        with self._lock:
+            self._probing.pop(resource, None)
+
+    def update(self, resource, response):
+        """Record the budget reported by a response"""
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self._lock:
+            self._probing.pop(resource, None)
+            if "X-RateLimit-Remaining" in headers:
+                remaining = int(headers["X-RateLimit-Remaining"])
+                reset_at = float(headers.get("X-RateLimit-Reset", 0))
+                if reset_at > self._reset_at.get(resource, 0):
+                    # New window: the header is authoritative
+                    self._remaining[resource] = remaining
+                    self._reset_at[resource] = reset_at
+                else:
+                    # Responses can arrive out of order within a window
+                    current = self._remaining.get(resource, remaining)
+                    self._remaining[resource] = min(current, remaining)
+                REGISTRY.set("github_rate_limit_remaining", self._remaining[resource], resource=resource)
+            retry_after = headers.get("Retry-After")
+            if retry_after and response.status_code in (403, 429):
+                self._blocked_until = max(self._blocked_until, time.time() + float(retry_after))
+
+    def snapshot(self):
+        """Return the last known remaining budget per bucket"""
+        with self._lock:
+            return dict(self._remaining)
+
+
+def is_rate_limited(response):
+    """Check if a response was rejected by a primary or secondary rate limit"""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    return ("Retry-After" in response.headers or
+            response.headers.get("X-RateLimit-Remaining") == "0")
+
+
+class GitHubAPI:
+    """Pooled, rate-limit-aware GitHub REST client safe to share across threads"""
+
+    def __init__(self, token=None, base_url=API_URL, session=None, max_retries=3, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.limiter = RateLimiter()
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+        # Sent with each request rather than set on the session, which may be
+        # shared with feed fetches to other hosts that must never see the token
+        self.headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def request(self, method, path, **kwargs):
+        """Send a request, waiting out rate limits and retrying when throttled"""
+        url = path if path.startswith("http") else self.base_url + path
+        if path.startswith(self.base_url):
+            path = path[len(self.base_url):]
+        resource = resource_for_path(path)
+        endpoint = endpoint_for_path(path)
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.wait(resource)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException:
+                # No headers to learn the budget from; let the next caller probe
+                self.limiter.release(resource)
+                raise
+            self.limiter.update(resource, response)
+            REGISTRY.inc("github_api_requests", method=method, endpoint=endpoint,
+                         status=response.status_code,
+                         cache="hit" if getattr(response, "from_cache", False) else "miss")
+            if is_rate_limited(response) and attempt < self.max_retries:
+                REGISTRY.inc("github_api_throttled", resource=resource)
+                if "Retry-After" not in response.headers and "X-RateLimit-Reset" not in response.headers:
+                    # Secondary limit without guidance: back off exponentially
+                    time.sleep(2 ** attempt * 5)
+                continue
+            break
+
+        response.raise_for_status()
+        return response
+
+    def get_json(self, path, params=None, **kwargs):
+        """GET a path and decode the JSON body"""
+        return self.request("GET", path, params=params, **kwargs).json()
+
+    def graphql(self, query, variables=None):
+        """Run a GraphQL query and return its data, raising on errors"""
+        body = self.request("POST", "/graphql",
+                            json={"query": query, "variables": variables or {}}).json()
+        if body.get("errors") and not body.get("data"):
+            raise requests.HTTPError(f"GraphQL error: {body['errors'][0].get('message')}")
+        return body["data"]
+
+    def iter_search(self, kind, query, limit=None, **params):
+        """Yield search results page by page, stopping once limit items were seen
+
+        Pages are requested lazily with per_page sized to the limit, so a
+        caller that only wants a handful of results pays for a single call.
+        """
+        cap = SEARCH_RESULT_CAP if limit is None else min(limit, SEARCH_RESULT_CAP)
+        if cap <= 0:
+            return
+        per_page = min(cap, MAX_PER_PAGE)
+        params = dict(params, q=query, per_page=per_page)
+        seen = 0
+        page = 1
+
+        while seen < cap:
+            params["page"] = page
+            items = self.get_json(f"/search/{kind}", params=params)["items"]
+            for item in items[:cap - seen]:
+                yield item
+            seen += min(len(items), cap - seen)
+            if len(items) < per_page:
+                break
+            page += 1
@@ -7,19 +7,38 @@ and automatically creates PRs to add them to the awesome-docker-ai-lists reposit
 """
 
 import os
-import re
+import base64
 import sys
 import time
 import random
+import json
 import argparse
 import requests
-from datetime import datetime, timedelta
-from github import Github, GithubException
+from datetime import datetime, timedelta, timezone
+from github import Github, InputGitTreeElement
+from github_api import GitHubAPI, API_URL, MAX_PER_PAGE
+from http_cache import ResponseCache, cached_session
+from feeds import fetch_feeds
+from keyword_matcher import KeywordMatcher
+from catalog import Catalog, Entry, format_row, link_label, markdown_sections
+from readme_index import normalize_url
+from crawl_state import CrawlState, PROPOSED, REJECTED, format_timestamp
+from metrics import REGISTRY
+from repo_signals import RequestBudget, fetch_all_signals
+from search_planner import sharded_search
+from near_duplicates import NearDuplicateIndex, index_item, suppress_near_duplicates
+from crawl_pipeline import (Candidate, SearchStats, search_stage, skip_known, suppress_clones,
+                            map_batches, classify_stage)
 
 # Configuration
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 REPO_OWNER = "ajeetraina"
 REPO_NAME = "awesome-docker-ai-lists"
+HTTP_CACHE_FILE = os.environ.get("HTTP_CACHE_FILE", ".http_cache.sqlite")
+CRAWL_STATE_FILE = os.environ.get("CRAWL_STATE_FILE", ".crawl_state.sqlite")
+DEDUP_INDEX_FILE = os.environ.get("DEDUP_INDEX_FILE", ".near_duplicates.sqlite")
+CATALOG_PATH = "catalog.jsonl"  # In the list's repository, next to README.md
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", API_URL)
 CATEGORIES = {
     "Model Context Protocol": ["mcp", "model context protocol", "claude"],
     "Generative AI": ["genai", "generative ai", "llm", "gpt", "language model"],
@@ -34,6 +53,15 @@ CATEGORIES = {
     "Security & Monitoring": ["security", "monitoring", "surveillance", "protection"],
     "Documentation & Knowledge Management": ["documentation", "knowledge", "information", "content management"]
 }
+DOCKER_TERMS = ["docker", "container", "containerization", "dockerfile"]
+AI_ML_TERMS = ["ai", "ml", "machine learning", "artificial intelligence",
+               "deep learning", "neural network", "tensorflow", "pytorch",
+               "model", "prediction", "analysis", "analytics", "llm"]
+
+# Docker/AI gate and category keywords compiled into one matcher, built once
+DOCKER_GROUP = "_docker"
+AI_ML_GROUP = "_ai_ml"
+CLASSIFIER = KeywordMatcher({DOCKER_GROUP: DOCKER_TERMS, AI_ML_GROUP: AI_ML_TERMS, **CATEGORIES})
 
 def setup_argument_parser():
     """Set up command line argument parser"""
@@ -41,75 +69,211 @@ def setup_argument_parser():
     parser.add_argument("--days", type=int, default=7, help="Number of days to look back")
     parser.add_argument("--limit", type=int, default=20, help="Max number of repositories to process")
     parser.add_argument("--dry-run", action="store_true", help="Don't create PRs, just print findings")
+    parser.add_argument("--workers", type=int, default=8, help="Number of search queries to run concurrently")
+    parser.add_argument("--batch-pr", action="store_true",
+                        help="Open a single PR with one commit adding every new entry")
+    parser.add_argument("--api-url", default=GITHUB_API_URL,
+                        help="GitHub API base URL, e.g. a local fake_github.py for load tests")
+    parser.add_argument("--cache-file", default=HTTP_CACHE_FILE,
+                        help="SQLite file caching GitHub and feed responses between runs")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the HTTP response cache")
+    parser.add_argument("--state-file", default=CRAWL_STATE_FILE,
+                        help="SQLite file remembering per-query high-water marks and classified repositories")
+    parser.add_argument("--dedup-file", default=DEDUP_INDEX_FILE,
+                        help="SQLite file holding the near-duplicate (MinHash/LSH) index of everything seen")
+    parser.add_argument("--no-dedup", action="store_true",
+                        help="Don't suppress forks, mirrors and near-duplicate candidates")
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the crawl state and re-evaluate everything in the --days window")
+    parser.add_argument("--enrich", choices=["search", "graphql"], default="search",
+                        help="Take repository metadata from the search payload or refresh it in batched GraphQL calls")
+    parser.add_argument("--signals", action="store_true",
+                        help="Also classify on content signals: Dockerfile/compose files and the start of the README")
+    parser.add_argument("--signal-workers", type=int, default=16,
+                        help="Number of repositories to fetch content signals for concurrently")
+    parser.add_argument("--signal-budget", type=int, default=500,
+                        help="Max API requests to spend on content signals (two per repository)")
+    parser.add_argument("--metrics-file",
+                        help="Write the run's timings, API call counts and candidate counts here as JSON "
+                             "(default: print them)")
     return parser.parse_args()
 
-def search_github_repositories(query, days_ago, limit=20):
-    """Search GitHub for repositories matching the query criteria"""
+def search_window_start(days_ago, since=None):
+    """Return the earliest push time a search covers: days_ago, or since if later"""
+    date_filter = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    if since and since > date_filter:
+        return since
+    return date_filter.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def search_github_repositories(query, days_ago, limit=20, api=None, since=None, is_known=None,
+                               truncated=None):
+    """Search GitHub for repositories matching the query criteria
+    
+    Yields search result payloads, newest pushes first. since, if given, is a
+    datetime (e.g. the query's high-water mark) that narrows the window
+    further than days_ago. Whenever the window matches more than the 1000
+    results GitHub returns per query, it is split into shards that each fit
+    (see search_planner.py), whatever the limit.
+    
+    Pages are sized to limit and fetched only while more results are wanted.
+    is_known, if given, tells results the crawler has already dealt with;
+    they are still yielded but don't count toward limit, so later pages make
+    up for them. truncated, if given, is called when results were left
+    unread because of the limit or a shard that couldn't be split under the
+    search cap.
+    """
     if not GITHUB_TOKEN:
         print("Error: GITHUB_TOKEN environment variable not set")
         sys.exit(1)
     
-    g = Github(GITHUB_TOKEN)
-    date_filter = datetime.now() - timedelta(days=days_ago)
-    date_str = date_filter.strftime("%Y-%m-%d")
-    
-    query = f"{query} pushed:>{date_str}"
-    print(f"Searching GitHub with query: {query}")
+    api = api or GitHubAPI(GITHUB_TOKEN)
+    start = search_window_start(days_ago, since)
+    print(f"Searching GitHub with query: {query} pushed:>{format_timestamp(start)}")
     
+    results = sharded_search(api, query, start, datetime.now(timezone.utc),
+                             per_page=max(1, min(limit, MAX_PER_PAGE)), truncated=truncated)
+    new = 0
     try:
-        repos = g.search_repositories(query, sort="updated", order="desc")
-        return list(repos)[:limit]
-    except GithubException as e:
-        print(f"GitHub API error: {e}")
-        return []
+        for item in results:
+            yield item
+            if is_known is None or not is_known(item):
+                new += 1
+                if new >= limit:
+                    if truncated:
+                        truncated()
+                    return
+    finally:
+        results.close()
 
 def get_repository_info(repo):
-    """Extract relevant information from a repository"""
-    return {
-        "name": repo.name,
-        "full_name": repo.full_name,
-        "owner": repo.owner.login,
-        "description": repo.description or "",
-        "url": repo.html_url,
-        "stars": repo.stargazers_count,
-        "updated_at": repo.updated_at,
-        "topics": repo.get_topics()
-    }
+    """Extract relevant information from a repository search result"""
+    return Candidate.from_search(repo)
 
-def has_docker_and_ai_ml(repo_info):
-    """Check if repository is related to both Docker and AI/ML"""
-    docker_terms = ["docker", "container", "containerization", "dockerfile"]
-    ai_ml_terms = ["ai", "ml", "machine learning", "artificial intelligence", 
-                  "deep learning", "neural network", "tensorflow", "pytorch",
-                  "model", "prediction", "analysis", "analytics", "llm"]
-    
-    # Check name, description and topics
-    content = (repo_info["name"] + " " + 
-              repo_info["description"] + " " + 
-              " ".join(repo_info["topics"])).lower()
+GRAPHQL_BATCH_SIZE = 100
+GRAPHQL_REPO_FIELDS = """
+fragment RepoFields on Repository {
+  databaseId
+  name
+  nameWithOwner
+  owner { login }
+  description
+  url
+  stargazerCount
+  updatedAt
+  pushedAt
+  isFork
+  isMirror
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+}
+"""
+
+def fetch_repository_metadata(full_names, api):
+    """Fetch repository info for many repositories in batched GraphQL calls
+
+    Each call resolves up to GRAPHQL_BATCH_SIZE repositories through aliased
+    repository() lookups, so enriching N candidates costs N / 100 requests
+    instead of one request per repository. Returns a dict keyed by full_name
+    holding a Candidate like get_repository_info; repositories that no
+    longer exist are left out.
+    """
+    full_names = list(full_names)
+    metadata = {}
     
-    has_docker = any(term in content for term in docker_terms)
-    has_ai_ml = any(term in content for term in ai_ml_terms)
+    for start in range(0, len(full_names), GRAPHQL_BATCH_SIZE):
+        batch = full_names[start:start + GRAPHQL_BATCH_SIZE]
+        params = []
+        lookups = []
+        variables = {}
+        for i, full_name in enumerate(batch):
+            owner, name = full_name.split("/", 1)
+            params.append(f"$o{i}: String!, $n{i}: String!")
+            lookups.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoFields }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+        query = (f"query({', '.join(params)}) {{\n  " + "\n  ".join(lookups) + "\n}\n" +
+                 GRAPHQL_REPO_FIELDS)
+        
+        try:
+            data = api.graphql(query, variables)
+        except requests.RequestException as e:
+            print(f"GitHub GraphQL error: {e}")
+            continue
+        
+        for i, full_name in enumerate(batch):
+            node = data.get(f"r{i}")
+            if not node:
+                continue
+            metadata[full_name] = Candidate.from_graphql(node)
     
-    return has_docker and has_ai_ml
+    return metadata
 
-def determine_category(repo_info):
-    """Determine best category for the repository"""
-    content = (repo_info["name"] + " " + 
-              repo_info["description"] + " " + 
-              " ".join(repo_info["topics"])).lower()
-    
-    scores = {}
-    for category, keywords in CATEGORIES.items():
-        score = sum(1 for keyword in keywords if keyword in content)
-        scores[category] = score
+def refresh_metadata(candidates, api):
+    """Replace a batch of candidates with fresh GraphQL metadata, keeping the query that found them"""
+    fresh = fetch_repository_metadata([candidate.full_name for candidate in candidates], api)
+    for candidate in candidates:
+        update = fresh.get(candidate.full_name)
+        yield update._replace(query=candidate.query) if update else candidate
+
+def add_signals(candidates, api, budget, max_workers):
+    """Attach content signals to the candidates of a batch that could plausibly qualify"""
+    wanted = [candidate.full_name for candidate in candidates if worth_enriching(candidate)]
+    signals = fetch_all_signals(wanted, api, budget, max_workers)
+    print(f"Fetched content signals for {len(signals)} of {len(wanted)} candidates")
+    for candidate in candidates:
+        yield candidate._replace(signals=signals.get(candidate.full_name))
+
+def repository_text(repo_info):
+    """Return the text the classifier looks at: name, description and topics"""
+    return (repo_info["name"] + " " + 
+            repo_info["description"] + " " + 
+            " ".join(repo_info.get("topics", [])))
+
+def classify_repository(repo_info):
+    """Scan a repository once, returning (is Docker AI/ML, category scores)
+
+    With content signals (see repo_signals.py), Docker needs evidence from the
+    repository itself (a Dockerfile or compose file in its root, or Docker in
+    its README), and the README can supply the AI/ML match and, failing the
+    metadata, the category.
+    """
+    scores = CLASSIFIER.score(repository_text(repo_info))
+    has_docker = scores.pop(DOCKER_GROUP) > 0
+    has_ai_ml = scores.pop(AI_ML_GROUP) > 0
     
+    signals = repo_info.get("signals")
+    if signals:
+        readme_scores = CLASSIFIER.score(signals["readme"])
+        readme_docker = readme_scores.pop(DOCKER_GROUP) > 0
+        readme_ai_ml = readme_scores.pop(AI_ML_GROUP) > 0
+        ships_docker = signals["dockerfile"] or signals["compose"]
+        # Only a repository without a README keeps a Docker match from its description alone
+        has_docker = ships_docker or readme_docker or (has_docker and not signals["readme"])
+        has_ai_ml = has_ai_ml or readme_ai_ml
+        if max(scores.values(), default=0) == 0:
+            scores = readme_scores
+    return has_docker and has_ai_ml, scores
+
+def worth_enriching(repo_info):
+    """Cheap prefilter: only candidates matching Docker or AI/ML terms get content signals"""
+    scores = CLASSIFIER.score(repository_text(repo_info))
+    return scores[DOCKER_GROUP] > 0 or scores[AI_ML_GROUP] > 0
+
+def has_docker_and_ai_ml(repo_info):
+    """Check if repository is related to both Docker and AI/ML"""
+    return classify_repository(repo_info)[0]
+
+def best_category(scores):
+    """Pick the highest scoring category, first listed winning ties"""
     if max(scores.values(), default=0) > 0:
         return max(scores.items(), key=lambda x: x[1])[0]
     return "AI/ML Use Cases"  # Default category
 
-def format_entry_for_readme(repo_info, category):
-    """Format repository information for README entry"""
+def determine_category(repo_info):
+    """Determine best category for the repository"""
+    return best_category(classify_repository(repo_info)[1])
+
+def catalog_entry(repo_info, category):
+    """Build the catalog entry for a repository or blog"""
     type_label = "Project"
     if "blog" in repo_info["name"].lower() or "article" in repo_info["name"].lower():
         type_label = "Blog"
@@ -119,53 +283,85 @@ def format_entry_for_readme(repo_info, category):
     if len(description) > 100:
         description = description[:97] + "..."
     
-    return f"| {name} | {description} | {type_label} | [View]({repo_info['url']}) |"
+    return Entry(category, name, description, type_label, link_label(type_label), repo_info["url"])
+
+def fetch_readme(api, ref="main"):
+    """Fetch this list's README.md at a ref, returning its text and blob SHA"""
+    readme = api.get_json(f"/repos/{REPO_OWNER}/{REPO_NAME}/contents/README.md",
+                          params={"ref": ref})
+    return base64.b64decode(readme["content"]).decode("utf-8"), readme["sha"]
+
+def fetch_catalog(api, readme_content, ref="main"):
+    """Fetch this list's catalog at a ref, building it from README.md if it has none yet"""
+    try:
+        body = api.get_json(f"/repos/{REPO_OWNER}/{REPO_NAME}/contents/{CATALOG_PATH}",
+                            params={"ref": ref})
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
+        return Catalog.from_markdown(readme_content)
+    return Catalog.loads(base64.b64decode(body["content"]).decode("utf-8"))
+
+def add_entries_to_catalog(catalog, readme_content, entries):
+    """Add entries to the catalog and re-render only their sections of the README
+    
+    entries is a list of catalog Entry records. Returns the updated README, the
+    entries actually added (not already listed) and the list of sections it
+    has no table for; their entries are not added.
+    """
+    present = set(markdown_sections(readme_content))
+    missing = list(dict.fromkeys(entry.section for entry in entries if entry.section not in present))
+    added = [entry for entry in entries if entry.section in present and catalog.add(entry)]
+    updated_content, _ = catalog.render(readme_content, {entry.section for entry in added})
+    return updated_content, added, missing
+
+def updated_files(api, ref, entries):
+    """Return the new catalog.jsonl and README.md with entries added, at a ref
+    
+    The catalog is fetched once, every entry is added to it and only the
+    sections they touch are re-rendered in README.md. Returns a {path: content}
+    dict, or None if no entry was new, the entries added and the sections
+    README.md has no table for, whose entries are left out.
+    """
+    readme_content, _ = fetch_readme(api, ref=ref)
+    catalog = fetch_catalog(api, readme_content, ref=ref)
+    updated_content, added, missing = add_entries_to_catalog(catalog, readme_content, entries)
+    for category in missing:
+        print(f"Warning: Could not find section {category} in README")
+    if not added:
+        return None, added, missing
+    return {CATALOG_PATH: catalog.dumps(), "README.md": updated_content}, added, missing
+
+def commit_files(repo, base_commit, files, message):
+    """Commit files on top of a commit through the Git Data API (blobs, tree, commit)"""
+    elements = []
+    for path, content in files.items():
+        blob = repo.create_git_blob(content, "utf-8")
+        elements.append(InputGitTreeElement(path, "100644", "blob", sha=blob.sha))
+    tree = repo.create_git_tree(elements, base_tree=base_commit.tree)
+    return repo.create_git_commit(message, tree, [base_commit])
 
-def create_pull_request(repo_info, category_name, entry_markdown, github_client):
-    """Create a pull request to add new repository to the README"""
+def create_pull_request(repo_info, category_name, entry, github_client, api):
+    """Create a pull request to add new repository to the list"""
     try:
         repo = github_client.get_repo(f"{REPO_OWNER}/{REPO_NAME}")
-        main_branch = repo.get_branch("main")
-        
-        # Create a new branch
-        branch_name = f"add-{repo_info['name'].lower()}-{int(time.time())}"
-        repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=main_branch.commit.sha)
-        
-        # Get the current README
-        readme_file = repo.get_contents("README.md", ref=branch_name)
-        readme_content = readme_file.decoded_content.decode("utf-8")
+        base_commit = repo.get_git_commit(repo.get_branch("main").commit.sha)
         
-        # Find the section to update
-        section_pattern = f"## {category_name}\n\n"
-        table_start = readme_content.find(section_pattern)
-        if table_start == -1:
-            print(f"Warning: Could not find section {category_name} in README")
+        files, _, missing = updated_files(api, base_commit.sha, [entry])
+        if files is None:
+            if not missing:
+                print(f"Warning: {repo_info['url']} is already listed")
             return False
         
-        table_start = readme_content.find("|", table_start)
-        table_end = readme_content.find("\n\n", table_start)
-        if table_end == -1:
-            table_end = len(readme_content)
-        
-        # Insert new entry at the end of the table
-        updated_content = (
-            readme_content[:table_end] + 
-            "\n" + entry_markdown + 
-            readme_content[table_end:]
-        )
-        
-        # Commit the change
-        repo.update_file(
-            path="README.md",
-            message=f"Add {repo_info['name']} to {category_name}",
-            content=updated_content,
-            sha=readme_file.sha,
-            branch=branch_name
-        )
+        # Commit the change to a new branch
+        message = f"Add {repo_info['name']} to {category_name}"
+        commit = commit_files(repo, base_commit, files, message)
+        branch_name = f"add-{repo_info['name'].lower()}-{int(time.time())}"
+        repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=commit.sha)
         
         # Create a pull request
         pr = repo.create_pull(
-            title=f"Add {repo_info['name']} to {category_name}",
+            title=message,
             body=f"This PR adds {repo_info['full_name']} to the {category_name} section.\n\n"
                  f"Stars: {repo_info['stars']}\n"
                  f"Description: {repo_info['description']}\n"
@@ -181,7 +377,53 @@ def create_pull_request(repo_info, category_name, entry_markdown, github_client)
         print(f"Error creating PR: {e}")
         return False
 
-def search_blogs(days_ago=30, limit=10):
+def create_batch_pull_request(additions, github_client, api):
+    """Create one pull request with a single commit adding every new entry
+    
+    additions is a list of (repo_info, category_name, entry) tuples, entry
+    being the catalog Entry. The catalog and README.md are fetched once, all
+    entries are applied together and both files are committed in one commit.
+    Returns the additions included in the PR: not those already listed or
+    without a README section, and none if the PR could not be created.
+    """
+    if not additions:
+        return []
+    
+    try:
+        repo = github_client.get_repo(f"{REPO_OWNER}/{REPO_NAME}")
+        base_commit = repo.get_git_commit(repo.get_branch("main").commit.sha)
+        
+        files, added, _ = updated_files(api, base_commit.sha, [entry for _, _, entry in additions])
+        added = set(added)
+        included = [addition for addition in additions if addition[2] in added]
+        if files is None:
+            return []
+        
+        message = f"Add {len(included)} Docker AI/ML resources"
+        commit = commit_files(repo, base_commit, files, message)
+        branch_name = f"crawler-additions-{int(time.time())}"
+        repo.create_git_ref(ref=f"refs/heads/{branch_name}", sha=commit.sha)
+        
+        lines = [f"This PR adds {len(included)} entries found by the crawler.\n"]
+        for info, category, _ in included:
+            stars = f" ({info['stars']} stars)" if info.get("stars") is not None else ""
+            lines.append(f"- **{category}**: [{info['full_name']}]({info['url']}){stars}"
+                         f" - {info['description']}")
+        pr = repo.create_pull(
+            title=message,
+            body="\n".join(lines),
+            head=branch_name,
+            base="main"
+        )
+        
+        print(f"Created PR #{pr.number}: {pr.html_url}")
+        return included
+    
+    except Exception as e:
+        print(f"Error creating PR: {e}")
+        return []
+
+def search_blogs(days_ago=30, limit=10, session=None):
     """Search for blog posts about Docker AI/ML"""
     # Example: this would need to be customized based on actual blog sources
     blog_sources = [
@@ -189,43 +431,21 @@ def search_blogs(days_ago=30, limit=10):
         "https://collabnix.com/category/docker/feed/"
     ]
     
-    blogs = []
+    since = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    feeds = fetch_feeds(blog_sources, since=since, limit=limit, session=session)
     
+    blogs = []
     for source in blog_sources:
-        try:
-            response = requests.get(source, timeout=10)
-            # Basic XML parsing - in a real implementation, use a proper XML/RSS parser
-            if response.status_code == 200:
-                # Extract blog entries (simplified example)
-                # In a real implementation, use proper RSS parsing
-                content = response.text
-                # For demonstration - would need proper parsing in real implementation
-                entries = re.findall(r'<item>(.+?)</item>', content, re.DOTALL)
-                
-                for entry in entries[:limit]:
-                    title_match = re.search(r'<title>(.+?)</title>', entry)
-                    link_match = re.search(r'<link>(.+?)</link>', entry)
-                    desc_match = re.search(r'<description>(.+?)</description>', entry)
-                    date_match = re.search(r'<pubDate>(.+?)</pubDate>', entry)
-                    
-                    if title_match and link_match:
-                        title = title_match.group(1)
-                        link = link_match.group(1)
-                        description = desc_match.group(1) if desc_match else ""
-                        date_str = date_match.group(1) if date_match else ""
-                        
-                        # Check if it's within our date range
-                        # This is simplified - would need proper date parsing
-                        if date_str and "Docker" in title and ("AI" in title or "ML" in title):
-                            blogs.append({
-                                "name": title,
-                                "full_name": title,
-                                "description": description[:100],
-                                "url": link,
-                                "type": "Blog"
-                            })
-        except Exception as e:
-            print(f"Error fetching blog from {source}: {e}")
+        for entry in feeds[source]:
+            title = entry["title"]
+            if entry["link"] and "Docker" in title and ("AI" in title or "ML" in title):
+                blogs.append({
+                    "name": title,
+                    "full_name": title,
+                    "description": entry["description"][:100],
+                    "url": entry["link"],
+                    "type": "Blog"
+                })
     
     return blogs
 
@@ -236,7 +456,23 @@ def main():
         print("Error: GITHUB_TOKEN environment variable not set")
         sys.exit(1)
     
-    g = Github(GITHUB_TOKEN)
+    g = Github(GITHUB_TOKEN, base_url=args.api_url)
+    cache = None if args.no_cache else ResponseCache(args.cache_file)
+    session = cached_session(cache) if cache else None
+    api = GitHubAPI(GITHUB_TOKEN, base_url=args.api_url, session=session)
+    state = CrawlState(args.state_file)
+    dedup = None if args.no_dedup else NearDuplicateIndex(args.dedup_file)
+    run_started = datetime.now(timezone.utc)
+    
+    # Index what the list already has so known entries cost nothing further
+    try:
+        with REGISTRY.timer("catalog"):
+            readme_content, _ = fetch_readme(api)
+            catalog = fetch_catalog(api, readme_content)
+        print(f"Catalog lists {len(catalog)} entries")
+    except requests.RequestException as e:
+        print(f"Warning: Could not load the catalog, duplicates won't be skipped: {e}")
+        catalog = Catalog()
     
     # Docker AI/ML related search queries
     search_queries = [
@@ -250,58 +486,161 @@ def main():
         "docker llm"
     ]
     
-    all_repos = []
+    # Candidates stream through the stages one batch at a time: queries share
+    # one rate-limit-aware client and all run at once, and nothing holds the
+    # whole result set
+    per_query_limit = max(1, args.limit // len(search_queries))
+    since = {} if args.full else {query: state.high_water(query) for query in search_queries}
+    stats = SearchStats()
+    # What skip_known will drop must not use up a query's limit. Judged by the
+    # state and catalog as they were at the start of the run, so what counts
+    # doesn't depend on what the main thread has classified meanwhile.
+    classified = {} if args.full else state.classified()
+    listed = set(catalog.by_url)
     
-    for query in search_queries:
-        repos = search_github_repositories(query, args.days, args.limit // len(search_queries))
-        all_repos.extend(repos)
-        # Avoid rate limiting
-        time.sleep(2)
+    def is_known(item):
+        if item["id"] in classified and classified[item["id"]] == item.get("pushed_at"):
+            return True
+        return normalize_url(item["html_url"]) in listed
     
-    # Remove duplicates
-    unique_repos = {repo.full_name: repo for repo in all_repos}
-    print(f"Found {len(unique_repos)} unique repositories")
+    candidates = search_stage(
+        search_queries,
+        lambda query: search_github_repositories(query, args.days, per_query_limit, api,
+                                                 since.get(query), is_known,
+                                                 lambda: stats.truncate(query)),
+        args.workers, stats)
+    candidates = skip_known(candidates, None if args.full else state, catalog, dedup)
+    if dedup is not None:
+        # Clones cost nothing further once suppressed here
+        candidates = suppress_clones(candidates, dedup, state)
+    if args.enrich == "graphql":
+        candidates = map_batches(candidates, lambda batch: refresh_metadata(batch, api),
+                                 GRAPHQL_BATCH_SIZE, phase="enrich")
+    if args.signals:
+        budget = RequestBudget(args.signal_budget)
+        candidates = map_batches(
+            candidates,
+            lambda batch: add_signals(batch, api, budget, args.signal_workers),
+            phase="signals")
     
     added_count = 0
-    for repo_name, repo in unique_repos.items():
+    additions = []
+    unproposed = set()  # Queries that found an accepted repository no PR includes
+    for repo_info, is_docker_ai, scores in classify_stage(candidates, classify_repository):
+        repo_name = repo_info.full_name
         print(f"Processing {repo_name}...")
-        repo_info = get_repository_info(repo)
         
-        if has_docker_and_ai_ml(repo_info):
-            category = determine_category(repo_info)
-            entry = format_entry_for_readme(repo_info, category)
+        if is_docker_ai:
+            category = best_category(scores)
+            entry = catalog_entry(repo_info, category)
             
             print(f"  - Identified as Docker AI/ML content in category: {category}")
-            print(f"  - Entry: {entry}")
+            print(f"  - Entry: {format_row(entry)}")
+            catalog.add(entry)
             
-            if not args.dry_run:
-                success = create_pull_request(repo_info, category, entry, g)
+            if args.batch_pr:
+                additions.append((repo_info, category, entry))
+            elif not args.dry_run:
+                with REGISTRY.timer("pull_request"):
+                    success = create_pull_request(repo_info, category, entry, g, api)
                 if success:
                     added_count += 1
+                    state.record(repo_info.id, repo_name, repo_info.pushed_at, PROPOSED)
+                    if dedup is not None:
+                        index_item(repo_info, dedup)
+                else:
+                    unproposed.add(repo_info.query)
                 # Add some delay between PRs
                 time.sleep(random.randint(5, 15))
         else:
             print(f"  - Not identified as Docker AI/ML content, skipping")
+            state.record(repo_info.id, repo_name, repo_info.pushed_at, REJECTED)
+    print(f"Found {stats.unique} unique repositories")
     
     # Optionally search blogs as well
     if args.days > 7:  # Only search blogs for longer timeframes
         print("\nSearching for blog posts...")
-        blogs = search_blogs(args.days)
+        with REGISTRY.timer("blog_feeds"):
+            blogs = search_blogs(args.days, session=session)
+        blogs = [blog for blog in blogs if not catalog.contains_url(blog["url"])]
+        if dedup is not None:
+            # Feeds keep their order, so the first copy of a cross-posted blog wins
+            blogs, duplicates = suppress_near_duplicates(blogs, dedup, persist=False)
+            for blog, canonical, _ in duplicates:
+                print(f"  - Skipping {blog['name']}: near-duplicate of {canonical}")
         for blog in blogs:
             category = determine_category(blog)
-            entry = format_entry_for_readme(blog, category)
+            entry = catalog_entry(blog, category)
+            catalog.add(entry)
             
             print(f"  - Blog: {blog['name']}")
             print(f"  - Category: {category}")
-            print(f"  - Entry: {entry}")
+            print(f"  - Entry: {format_row(entry)}")
             
-            if not args.dry_run:
-                success = create_pull_request(blog, category, entry, g)
+            if args.batch_pr:
+                additions.append((blog, category, entry))
+            elif not args.dry_run:
+                with REGISTRY.timer("pull_request"):
+                    success = create_pull_request(blog, category, entry, g, api)
                 if success:
                     added_count += 1
+                    if dedup is not None:
+                        index_item(blog, dedup)
                 time.sleep(random.randint(5, 15))
     
-    print(f"\nDone! Created {added_count} pull requests.")
+    if args.batch_pr:
+        if not args.dry_run:
+            with REGISTRY.timer("pull_request"):
+                included = create_batch_pull_request(additions, g, api)
+            added_count = len(included)
+            proposed = set()
+            for info, _, _ in included:
+                if dedup is not None:
+                    index_item(info, dedup)
+                if isinstance(info, Candidate):
+                    state.record(info.id, info.full_name, info.pushed_at, PROPOSED)
+                    proposed.add(info.id)
+            unproposed.update(info.query for info, _, _ in additions
+                              if isinstance(info, Candidate) and info.id not in proposed)
+        print(f"\nDone! Added {added_count} entries in a single pull request.")
+    else:
+        print(f"\nDone! Created {added_count} pull requests.")
+    
+    # Only a real run moves the state forward. A query whose results were cut
+    # off by its limit keeps its old mark, so the rest is picked up next time.
+    # Known repositories don't count toward the limit, so a query's mark
+    # advances as soon as everything new in its window has been read. A query
+    # that found a repository whose PR failed keeps its mark as well; the
+    # repository isn't recorded, so the next run classifies and proposes it again.
+    if not args.dry_run:
+        for query in search_queries:
+            if (query not in stats.truncated and query not in stats.failed
+                    and query not in unproposed):
+                state.set_high_water(query, run_started)
+        state.commit()
+        if dedup is not None:
+            dedup.commit()
+    state.close()
+    if dedup is not None:
+        dedup.close()
+    
+    if cache:
+        cache_stats = cache.stats()
+        print(f"HTTP cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+              f"({cache_stats['entries']} entries, {cache_stats['bytes']} bytes)")
+        for name, value in cache_stats.items():
+            REGISTRY.set(f"http_cache_{name}", value)
+        cache.close()
+    
+    REGISTRY.set("crawler_entries_added", added_count)
+    summary = REGISTRY.summary()
+    if args.metrics_file:
+        with open(args.metrics_file, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Run metrics written to {args.metrics_file}")
+    else:
+        print("Run metrics:")
+        print(json.dumps(summary, indent=2))
 
 if __name__ == "__main__":
     main()
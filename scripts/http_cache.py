@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP conditional-request cache
+
+Stores GET response bodies together with their ETag/Last-Modified validators
+in a small SQLite file and revalidates them with If-None-Match /
+If-Modified-Since. A 304 Not Modified is answered from the stored body, which
+costs no GitHub rate-limit quota and almost no transfer. The store is bounded
+in size and evicts least recently used entries first.
+
+Usage:
+    cache = ResponseCache("http_cache.sqlite")
+    session = cached_session(cache)
+    session.get(url)  # later runs revalidate instead of re-downloading
+"""
+
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+POOL_SIZE = 32
+
+# Headers describing the transfer of a 304 rather than the cached representation
+_TRANSFER_HEADERS = {"content-length", "content-encoding", "transfer-encoding", "connection"}
+
+
+class ResponseCache:
+    """Size-bounded LRU store of response bodies and their validators"""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used)")
+        self._db.commit()
+
+    def get(self, key):
+        """Return the stored entry for a key, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "headers": json.loads(row[2]),
+            "body": bytes(row[3]),
+        }
+
+    def put(self, key, url, headers, body):
+        """Store a response body with its validators, evicting old entries if needed"""
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, headers.get("ETag"), headers.get("Last-Modified"),
+                 json.dumps(dict(headers)), sqlite3.Binary(body), size, time.time())
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def record(self, hit):
+        """Count a revalidated hit or a full-body miss"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """Return hit/miss counters and the current store size"""
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+            }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def cache_key(request):
+    """Key a request by URL, Accept header and (hashed) credentials"""
+    parts = [request.url, request.headers.get("Accept", "")]
+    auth = request.headers.get("Authorization")
+    if auth:
+        parts.append(hashlib.sha256(auth.encode("utf-8")).hexdigest()[:16])
+    return "\n".join(parts)
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that revalidates GETs against a ResponseCache"""
+
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        key = cache_key(request)
+        entry = self.cache.get(key)
+        if entry:
+            request = request.copy()
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.record(hit=True)
+            return self._replay(request, response, entry)
+
+        if response.status_code == 200 and ("ETag" in response.headers or
+                                             "Last-Modified" in response.headers):
+            self.cache.record(hit=False)
+            if kwargs.get("stream"):
+                # Reading .content here would download the whole body before the
+                # caller reads its first chunk; store it only if it is read to the end
+                self._tee(key, request, response)
+            else:
+                self.cache.put(key, request.url, response.headers, response.content)
+        return response
+
+    def _tee(self, key, request, response):
+        """Cache a streamed body as the caller reads it, once it has been read in full"""
+        iter_content = response.iter_content
+
+        def tee(chunk_size=1, decode_unicode=False):
+            if decode_unicode:
+                yield from iter_content(chunk_size, decode_unicode)
+                return
+            body = []
+            for chunk in iter_content(chunk_size):
+                body.append(chunk)
+                yield chunk
+            self.cache.put(key, request.url, response.headers, b"".join(body))
+
+        response.iter_content = tee
+
+    def _replay(self, request, not_modified, entry):
+        """Build a 200 response from a cached body and the fresh 304 headers"""
+        headers = CaseInsensitiveDict(entry["headers"])
+        for name, value in not_modified.headers.items():
+            if name.lower() not in _TRANSFER_HEADERS:
+                headers[name] = value
+        for name in _TRANSFER_HEADERS:
+            headers.pop(name, None)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = headers
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.encoding = requests.utils.get_encoding_from_headers(headers)
+        response._content = entry["body"]
+        response._content_consumed = True  # So iter_content and close() work without a raw stream
+        response.from_cache = True
+        not_modified.close()
+        return response
+
+
+def cached_session(cache, session=None, pool_size=POOL_SIZE):
+    """Mount a pooled CachingAdapter on a (new) requests session"""
+    session = session or requests.Session()
+    adapter = CachingAdapter(cache, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
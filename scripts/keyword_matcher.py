@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Single-pass multi-keyword matcher for the crawler's classifier
+
+All keywords of all groups are compiled once into one regular expression, so
+a document is scanned a single time no matter how many keywords or groups
+there are, and every group's score comes back from that one scan.
+
+Matching rules:
+- text is lowercased and "-", "_" and runs of whitespace count as one space,
+  so the topic "machine-learning" matches the keyword "machine learning"
+- every keyword must start at a word boundary ("ai" never hits "maintain")
+- keywords of up to three characters must also end at a word boundary,
+  optionally pluralized ("llm" matches "llms" but "hf" never hits "hfile")
+- longer keywords match as word prefixes ("container" matches
+  "containerized", "health" matches "healthcare")
+"""
+
+import re
+
+SHORT_TERM_LENGTH = 3
+
+_SEPARATORS = re.compile(r"[\s_-]+")
+
+
+def normalize_text(text):
+    """Lowercase text and collapse separators the way keywords are compiled"""
+    return _SEPARATORS.sub(" ", text.lower())
+
+
+def _is_short(term):
+    return len(term) <= SHORT_TERM_LENGTH
+
+
+def _trie_pattern(terms):
+    """Compile terms into a regex that branches per character like a trie"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node, prefix):
+        # Continuations come first so the longest keyword is preferred
+        branches = [re.escape(char) + build(child, prefix + char)
+                    for char, child in sorted(node.items()) if char]
+        if "" in node:
+            # End of a keyword. The tail of short keywords is a lookahead, so
+            # the captured text is always exactly the keyword.
+            branches.append(r"(?=s?\b)" if _is_short(prefix) else "")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie, "")
+
+
+class KeywordMatcher:
+    """Compiled matcher scoring a document against named keyword groups"""
+
+    def __init__(self, groups):
+        # groups: mapping of group name -> keywords, scored in mapping order
+        self.groups = list(groups)
+        self.terms = []
+        term_groups = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                term = normalize_text(keyword).strip()
+                if term not in term_groups:
+                    term_groups[term] = []
+                    self.terms.append(term)
+                if group not in term_groups[term]:
+                    term_groups[term].append(group)
+        self._term_groups = term_groups
+
+        # One trie-shaped pattern, trying longer continuations first so the
+        # longest keyword starting at a position wins, inside a zero-width
+        # lookahead so matches may overlap across positions
+        self._index = {term: i for i, term in enumerate(self.terms)}
+        self._pattern = re.compile(r"(?=\b(" + _trie_pattern(self.terms) + "))")
+
+        # ...plus the shorter keywords a longer match implies ("ai tool" -> "ai")
+        self._implied = {}
+        for i, term in enumerate(self.terms):
+            self._implied[i] = [
+                j for j, other in enumerate(self.terms)
+                if j != i and term.startswith(other) and
+                (not _is_short(other) or term[len(other)] == " ")
+            ]
+
+    def groups_of(self, term):
+        """Return the groups a (normalized) keyword belongs to"""
+        return self._term_groups[term]
+
+    def find_terms(self, text):
+        """Return the set of distinct keywords found in text"""
+        found = set()
+        for match in self._pattern.finditer(normalize_text(text)):
+            i = self._index[match.group(1)]
+            found.add(i)
+            found.update(self._implied[i])
+        return {self.terms[i] for i in found}
+
+    def score(self, text):
+        """Return {group: number of distinct keywords of the group found}"""
+        scores = dict.fromkeys(self.groups, 0)
+        for term in self.find_terms(text):
+            for group in self.groups_of(term):
+                scores[group] += 1
+        return scores
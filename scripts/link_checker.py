@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Link health checker for the awesome list
+
+Reads the link of every entry in catalog.jsonl and checks them
+concurrently: an asyncio loop schedules the checks, with a cap on requests
+in flight per host and a politeness delay between requests to the same
+host, and a thread pool sends them over one pooled keep-alive session.
+Each link is tried with HEAD first, falling back to a streamed GET for
+servers that reject or mishandle HEAD.
+
+Results are kept in a small SQLite file with the time they were taken, so a
+re-run only re-checks links whose result is older than the TTL. The run
+ends with a report of the broken rows and, optionally, writes them as JSON.
+
+Usage:
+    python link_checker.py                        # check ../catalog.jsonl
+    python link_checker.py --json broken.json     # also write the broken rows
+    python link_checker.py --ttl-hours 0          # re-check everything
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import sqlite3
+import argparse
+import requests
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+from metrics import REGISTRY
+from catalog import CATALOG_FILE, Catalog
+
+LINK_STATUS_FILE = os.environ.get("LINK_STATUS_FILE", ".link_status.sqlite")
+MAX_WORKERS = 64
+PER_HOST = 8
+POLITENESS_DELAY = 0.05  # Seconds between requests to one host
+TIMEOUT = 10
+TTL_HOURS = 24
+USER_AGENT = "awesome-docker-ai-lists-link-checker"
+RATE_LIMITED = 429
+
+LinkResult = namedtuple("LinkResult", ["url", "status", "error", "checked_at"])
+
+
+def is_broken(result):
+    """Check if a result means the link is dead
+
+    A 429 only says the host wants us to slow down, not that the page is gone.
+    """
+    if result.status is None:
+        return True
+    return result.status >= 400 and result.status != RATE_LIMITED
+
+
+def extract_links(catalog):
+    """Return every entry of a Catalog that links to the web"""
+    return [entry for entry in catalog
+            if entry.url and entry.url.startswith(("http://", "https://"))]
+
+
+class LinkStore:
+    """SQLite-backed results of earlier checks, by URL"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS links ("
+            " url TEXT PRIMARY KEY,"
+            " status INTEGER,"
+            " error TEXT,"
+            " checked_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, url):
+        """Return the last result for a URL, or None if it was never checked"""
+        row = self._db.execute(
+            "SELECT url, status, error, checked_at FROM links WHERE url = ?", (url,)).fetchone()
+        return LinkResult(*row) if row else None
+
+    def stale(self, urls, ttl):
+        """Return the URLs with no result, or one older than ttl seconds"""
+        cutoff = time.time() - ttl
+        fresh = set()
+        urls = list(urls)
+        for start in range(0, len(urls), 500):
+            chunk = urls[start:start + 500]
+            fresh.update(url for (url,) in self._db.execute(
+                f"SELECT url FROM links WHERE checked_at >= ? AND url IN ({','.join('?' * len(chunk))})",
+                [cutoff, *chunk]))
+        return [url for url in urls if url not in fresh]
+
+    def is_broken(self, url):
+        """Check if a URL's last result says it is dead (unchecked URLs are not)"""
+        result = self.get(url) if url else None
+        return result is not None and is_broken(result)
+
+    def put(self, result):
+        """Store a result (applied on commit)"""
+        self._db.execute("INSERT OR REPLACE INTO links VALUES (?, ?, ?, ?)", tuple(result))
+
+    def commit(self):
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+class LinkChecker:
+    """Checks many URLs at once, politely per host, over pooled connections"""
+
+    def __init__(self, max_workers=MAX_WORKERS, per_host=PER_HOST, delay=POLITENESS_DELAY,
+                 timeout=TIMEOUT, session=None):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.delay = delay
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=per_host)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.setdefault("User-Agent", USER_AGENT)
+        self.session = session
+
+    def fetch(self, url):
+        """Check one URL with HEAD, then GET if HEAD fails; blocking"""
+        status, error = None, None
+        for method in ("HEAD", "GET"):
+            try:
+                # stream=True: a GET stops after the headers, the body is never read
+                with self.session.request(method, url, timeout=self.timeout,
+                                          allow_redirects=True, stream=True) as response:
+                    status, error = response.status_code, None
+            except requests.RequestException as e:
+                status, error = None, f"{type(e).__name__}: {e}"
+            if status is not None and status < 400:
+                break
+        REGISTRY.inc("link_checks", status=status if status is not None else "error")
+        return LinkResult(url, status, error, time.time())
+
+    async def check_all(self, urls):
+        """Check every URL, returning results in the same order"""
+        loop = asyncio.get_running_loop()
+        hosts = {}
+        next_slot = {}
+
+        async def check(url, executor):
+            host = urlsplit(url).netloc.lower()
+            if host not in hosts:
+                hosts[host] = asyncio.Semaphore(self.per_host)
+            async with hosts[host]:
+                # Space requests to one host out, no matter how many are allowed at once
+                now = loop.time()
+                slot = max(now, next_slot.get(host, now))
+                next_slot[host] = slot + self.delay
+                await asyncio.sleep(slot - now)
+                return await loop.run_in_executor(executor, self.fetch, url)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return await asyncio.gather(*(check(url, executor) for url in urls))
+
+
+def check_links(urls, store, ttl, checker=None):
+    """Check the URLs whose stored result is missing or older than ttl seconds
+
+    Returns how many were checked; the results are stored and committed.
+    """
+    checker = checker or LinkChecker()
+    stale = store.stale(dict.fromkeys(urls), ttl)
+    if stale:
+        with REGISTRY.timer("link_check"):
+            results = asyncio.run(checker.check_all(stale))
+        for result in results:
+            store.put(result)
+        store.commit()
+    return len(stale)
+
+
+def broken_rows(links, store):
+    """Return the entries with broken links as dicts, ready for json.dump"""
+    rows = []
+    for entry in links:
+        result = store.get(entry.url)
+        if result and is_broken(result):
+            rows.append({"section": entry.section, "title": entry.title, "type": entry.type,
+                         "url": entry.url, "status": result.status, "error": result.error})
+    return rows
+
+
+def setup_argument_parser():
+    """Set up command line argument parser"""
+    parser = argparse.ArgumentParser(description="Check the links of every entry in the awesome list")
+    parser.add_argument("--catalog", default=CATALOG_FILE, help="Catalog of entries to check (JSON Lines)")
+    parser.add_argument("--readme", help="Check the tables of this Markdown file instead of the catalog")
+    parser.add_argument("--status-file", default=LINK_STATUS_FILE,
+                        help="SQLite file keeping check results between runs")
+    parser.add_argument("--ttl-hours", type=float, default=TTL_HOURS,
+                        help="Re-check links whose last result is older than this")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Requests in flight at once")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="Requests in flight per host")
+    parser.add_argument("--delay", type=float, default=POLITENESS_DELAY,
+                        help="Seconds between requests to the same host")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Seconds to wait for each request")
+    parser.add_argument("--json", help="Write the broken rows here as JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = setup_argument_parser()
+
+    if args.readme:
+        with open(args.readme, encoding="utf-8") as f:
+            catalog = Catalog.from_markdown(f.read())
+    else:
+        catalog = Catalog.load(args.catalog)
+    links = extract_links(catalog)
+    urls = [entry.url for entry in links]
+    store = LinkStore(args.status_file)
+    checker = LinkChecker(args.workers, args.per_host, args.delay, args.timeout)
+
+    started = time.perf_counter()
+    checked = check_links(urls, store, args.ttl_hours * 3600, checker)
+    unique = len(set(urls))
+    print(f"Checked {checked} of {unique} links in {time.perf_counter() - started:.1f}s "
+          f"({unique - checked} still fresh from the last {args.ttl_hours:g}h)")
+
+    broken = broken_rows(links, store)
+    store.close()
+    for row in broken:
+        print(f"  - {row['section']} / {row['title']}: {row['url']} "
+              f"-> {row['status'] or row['error']}")
+    print(f"{len(broken)} of {len(links)} entries have broken links")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(broken, f, indent=2)
+        print(f"Broken rows written to {args.json}")
+
+    sys.exit(1 if broken else 0)
+
+
+if __name__ == "__main__":
+    main()
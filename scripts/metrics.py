@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Lightweight metrics for the crawler and the tweet scheduler
+
+Counters, gauges and phase timers live in one thread-safe registry that is
+exported either as Prometheus text (served over HTTP by the long-running
+tweet scheduler) or as a JSON summary (written by the crawler at the end of
+a run). Only the standard library is used.
+
+Usage:
+    from metrics import REGISTRY
+    with REGISTRY.timer("search"):
+        ...
+    REGISTRY.inc("github_api_requests", endpoint="/search/repositories", status=200)
+    REGISTRY.serve(9108)          # Prometheus text on GET /metrics
+    summary = REGISTRY.summary()  # plain dict, ready for json.dump
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PHASE_TIMER = "phase_seconds"
+
+
+def _labels_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(key, escaped)) + "}"
+
+
+def _summary_label(key):
+    return ",".join(f"{name}={value}" for name, value in key)
+
+
+class Metrics:
+    """Thread-safe registry of counters, gauges and timers"""
+
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timers = {}
+        self._collectors = []
+
+    def inc(self, name, value=1, **labels):
+        """Add to a counter"""
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Set a gauge to its current value"""
+        with self._lock:
+            self._gauges[(name, _labels_key(labels))] = value
+
+    def observe(self, name, seconds, **labels):
+        """Record one duration"""
+        key = (name, _labels_key(labels))
+        with self._lock:
+            count, total, longest = self._timers.get(key, (0, 0.0, 0.0))
+            self._timers[key] = (count + 1, total + seconds, max(longest, seconds))
+
+    @contextmanager
+    def timer(self, phase, **labels):
+        """Time the enclosed block as one run of a phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(PHASE_TIMER, time.perf_counter() - start, phase=phase, **labels)
+
+    def collect(self, collector):
+        """Register a function called before every export, e.g. to refresh gauges"""
+        self._collectors.append(collector)
+
+    def _run_collectors(self):
+        for collector in self._collectors:
+            try:
+                collector(self)
+            except Exception:
+                # A broken collector must not take the whole export down
+                pass
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format"""
+        self._run_collectors()
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            timers = sorted(self._timers.items())
+
+        lines = []
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, key), value in counters:
+            name = f"{self.prefix}{name}_total"
+            declare(name, "counter")
+            lines.append(f"{name}{_format_labels(key)} {value}")
+        for (name, key), value in gauges:
+            name = f"{self.prefix}{name}"
+            declare(name, "gauge")
+            lines.append(f"{name}{_format_labels(key)} {value}")
+        for (name, key), (count, total, _) in timers:
+            name = f"{self.prefix}{name}"
+            declare(name, "summary")
+            lines.append(f"{name}_count{_format_labels(key)} {count}")
+            lines.append(f"{name}_sum{_format_labels(key)} {total:.6f}")
+        uptime = f"{self.prefix}uptime_seconds"
+        declare(uptime, "gauge")
+        lines.append(f"{uptime} {time.time() - self.started:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """Return every metric as a JSON-serializable dict, grouped by name"""
+        self._run_collectors()
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            timers = sorted(self._timers.items())
+
+        result = {"duration_s": round(time.time() - self.started, 3),
+                  "counters": {}, "gauges": {}, "timers": {}}
+        for (name, key), value in counters:
+            result["counters"].setdefault(name, {})[_summary_label(key)] = value
+        for (name, key), value in gauges:
+            result["gauges"].setdefault(name, {})[_summary_label(key)] = value
+        for (name, key), (count, total, longest) in timers:
+            result["timers"].setdefault(name, {})[_summary_label(key)] = {
+                "count": count, "total_s": round(total, 6), "max_s": round(longest, 6)}
+        return result
+
+    def serve(self, port, host="0.0.0.0"):
+        """Serve /metrics from a background thread and return the server"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes every few seconds would drown out the real log
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+
+# The process-wide registry both entry points record into
+REGISTRY = Metrics()
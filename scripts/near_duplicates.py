@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for crawl candidates
+
+Forks, mirrors and template clones of one project (and blog posts
+cross-posted to several feeds) share almost all of their name, description
+and topics. Each candidate is reduced to a MinHash signature over word
+shingles of that text, and signatures are bucketed by locality-sensitive
+hashing: the signature is cut into bands, and two candidates only get
+compared if some band hashes to the same bucket. Buckets live in an indexed
+SQLite table that persists across runs, so checking a candidate against
+everything ever seen costs a handful of lookups rather than a pass over the
+whole history. Candidates are checked a batch at a time: their signatures
+are computed in one vectorised pass, and the buckets of the whole batch are
+looked up together.
+
+Within a cluster of near-duplicates the most-starred candidate is kept as
+the canonical one. Only what is listed or proposed is persisted as canonical;
+other kept candidates (which may still be rejected, or whose PR may fail) are
+indexed for the current run only, so they never suppress a later copy for good.
+"""
+
+import re
+import sqlite3
+import hashlib
+import numpy as np
+from functools import lru_cache
+
+from readme_index import normalize_url
+
+NUM_PERMUTATIONS = 64
+BANDS = 16  # 16 bands of 4 rows: pairs above ~0.5 similarity become candidates
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SIMILARITY_THRESHOLD = 0.8
+MIN_SHINGLES = 6  # Shorter texts say too little to call anything a duplicate
+PRIME = (1 << 31) - 1
+
+# Fixed coefficients: signatures are persisted, so they must not change between runs
+_rng = np.random.default_rng(20240101)
+_A = _rng.integers(1, PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_BAND_MULTIPLIERS = _rng.integers(1 << 32, 1 << 63, ROWS_PER_BAND, dtype=np.uint64) | np.uint64(1)
+_BAND_SCRAMBLE = np.uint64(0x9E3779B97F4A7C15)
+BUCKET_SCHEME = 2  # Bumped whenever band_hashes changes; stored buckets are then rebuilt
+
+SQL_CHUNK = 300  # Rows per query, within SQLite's default limit on parameters
+
+CAMEL_CASE_PATTERN = re.compile(r"([a-z0-9])([A-Z])")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokens(text):
+    """Lowercase words of a text, splitting camelCase and kebab/snake_case names"""
+    return WORD_PATTERN.findall(CAMEL_CASE_PATTERN.sub(r"\1 \2", text).lower())
+
+
+def shingles(item):
+    """Word unigrams and bigrams of an item's name, description and topics"""
+    words = tokens(item.get("name", "")) + tokens(item.get("description") or "")
+    words += sorted(set(word for topic in item.get("topics", []) for word in tokens(topic)))
+    return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+@lru_cache(maxsize=1 << 16)  # Common words and bigrams recur across most items
+def _stable_hash(text):
+    # Python's hash() is salted per process; persisted signatures need a stable one
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+def minhashes(items):
+    """Return the MinHash signatures of many items (None for a text too short) in one pass
+
+    The shingle hashes of every item go through the permutations as one
+    matrix, and each item's signature is the column-wise minimum of its slice.
+    """
+    hashes, lengths = [], []
+    for item in items:
+        grams = shingles(item)
+        lengths.append(len(grams) if len(grams) >= MIN_SHINGLES else 0)
+        if lengths[-1]:
+            hashes.extend(_stable_hash(gram) % PRIME for gram in grams)
+    if not hashes:
+        return [None] * len(lengths)
+    values = np.array(hashes, dtype=np.uint64)
+    starts = np.cumsum([0] + [length for length in lengths if length])[:-1]
+    permuted = (_A[:, None] * values[None, :] + _B[:, None]) % PRIME
+    rows = iter(np.minimum.reduceat(permuted, starts, axis=1).T)
+    return [next(rows) if length else None for length in lengths]
+
+
+def minhash(item):
+    """Return an item's MinHash signature, or None if its text is too short"""
+    return minhashes([item])[0]
+
+
+def band_hashes_many(signatures):
+    """Hash each band of many signatures to a bucket id, as a (signatures x BANDS) array
+
+    A band's rows are mixed with odd 64-bit multipliers (wrapping), then
+    scrambled so nearby row values land in unrelated buckets.
+    """
+    rows = np.asarray(signatures, dtype=np.uint64).reshape(-1, BANDS, ROWS_PER_BAND)
+    mixed = (rows * _BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+    mixed ^= mixed >> np.uint64(29)
+    mixed *= _BAND_SCRAMBLE
+    mixed ^= mixed >> np.uint64(32)
+    return mixed.view(np.int64)
+
+
+def band_hashes(signature):
+    """Hash each band of a signature to a bucket id"""
+    return band_hashes_many([signature])[0].tolist()
+
+
+def similarity(first, second):
+    """Estimate the Jaccard similarity of two signatures"""
+    return float(np.mean(first == second))
+
+
+class NearDuplicateIndex:
+    """Persistent LSH index of candidate signatures"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " key TEXT PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " stars INTEGER NOT NULL,"
+            " signature BLOB NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " band INTEGER NOT NULL,"
+            " bucket INTEGER NOT NULL,"
+            " key TEXT NOT NULL,"
+            " PRIMARY KEY (band, bucket, key)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS buckets_by_key ON buckets (key);"
+        )
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != BUCKET_SCHEME:
+            self._rebucket()
+        self._db.commit()
+        # Items indexed during this run, persisted or not: one signature matrix
+        # row each, so a bucket's worth of them is compared in one operation
+        self._run_rows = {}  # key -> row
+        self._run_info = []  # row -> (key, name, stars)
+        self._run_signatures = np.empty((0, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._run_buckets = {}  # (band, bucket) -> rows
+
+    def _rebucket(self):
+        """Recompute every bucket from the stored signatures, after band hashing changed"""
+        self._db.execute("DELETE FROM buckets")
+        rows = self._db.execute("SELECT key, signature FROM items").fetchall()
+        if rows:
+            buckets = band_hashes_many([np.frombuffer(blob, dtype="<u4") for _, blob in rows])
+            self._db.executemany("INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+                                 [(band, bucket, key)
+                                  for (key, _), row in zip(rows, buckets.tolist())
+                                  for band, bucket in enumerate(row)])
+        self._db.execute(f"PRAGMA user_version = {BUCKET_SCHEME}")
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def stored_candidates(self, signatures):
+        """Return, per signature, {key: (name, stars, signature)} of stored items sharing a bucket
+
+        The bucket lookups of a whole batch go out as a few joins on the
+        primary key, and the items they find are read in a few more queries.
+        """
+        if not len(signatures):
+            return []
+        probes = [(i, band, bucket) for i, row in enumerate(band_hashes_many(signatures).tolist())
+                  for band, bucket in enumerate(row)]
+        found = [set() for _ in signatures]
+        for start in range(0, len(probes), SQL_CHUNK):
+            chunk = probes[start:start + SQL_CHUNK]
+            values = ", ".join(["(?, ?, ?)"] * len(chunk))
+            for i, other in self._db.execute(
+                    f"WITH probes(item, band, bucket) AS (VALUES {values}) "
+                    "SELECT p.item, b.key FROM probes p "
+                    "JOIN buckets b ON b.band = p.band AND b.bucket = p.bucket",
+                    [value for probe in chunk for value in probe]):
+                found[i].add(other)
+        stored = {}
+        keys = list(set().union(*found))
+        for start in range(0, len(keys), SQL_CHUNK):
+            chunk = keys[start:start + SQL_CHUNK]
+            for other, name, stars, blob in self._db.execute(
+                    "SELECT key, name, stars, signature FROM items "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})", chunk):
+                stored[other] = (name, stars, np.frombuffer(blob, dtype="<u4"))
+        return [{other: stored[other] for other in others} for others in found]
+
+    def matches(self, key, signature, stored=None, buckets=None):
+        """Return (key, name, stars, similarity) of indexed near-duplicates, most-starred first
+
+        stored, if given, is what stored_candidates returned for this
+        signature, so checking a batch costs no further queries; buckets, if
+        given, are its band_hashes.
+        """
+        if stored is None:
+            stored = self.stored_candidates([signature])[0]
+        result = {}
+        rows = set()
+        for band, bucket in enumerate(buckets or band_hashes(signature)):
+            rows.update(self._run_buckets.get((band, bucket), ()))
+        if rows:
+            rows = np.fromiter(rows, dtype=np.intp, count=len(rows))
+            scores = (self._run_signatures[rows] == signature).mean(axis=1)
+            close = scores >= SIMILARITY_THRESHOLD
+            for row, score in zip(rows[close].tolist(), scores[close].tolist()):
+                other, name, stars = self._run_info[row]
+                result[other] = (other, name, stars, score)
+        # This run's copy of an item supersedes the stored one
+        others = [other for other in stored if other not in self._run_rows]
+        if others:
+            scores = (np.stack([stored[other][2] for other in others]) == signature).mean(axis=1)
+            for other, score in zip(others, scores.tolist()):
+                if score >= SIMILARITY_THRESHOLD:
+                    result[other] = (other, stored[other][0], stored[other][1], score)
+        result.pop(key, None)
+        return sorted(result.values(), key=lambda match: match[2], reverse=True)
+
+    def is_persisted(self, key):
+        """Check if a key is indexed for good, not just for this run"""
+        return self._db.execute("SELECT 1 FROM items WHERE key = ?", (key,)).fetchone() is not None
+
+    def add(self, key, name, stars, signature, persist=True, buckets=None):
+        """Index an item, replacing what was stored under the same key
+
+        A persisted item is also written to the database (applied on commit);
+        any other is only matched against for the rest of the run. buckets, if
+        given, are the signature's band_hashes.
+        """
+        buckets = buckets or band_hashes(signature)
+        row = self._run_rows.setdefault(key, len(self._run_info))
+        if row == len(self._run_info):
+            self._run_info.append(None)
+            if row == len(self._run_signatures):
+                grown = np.empty((max(64, 2 * row), NUM_PERMUTATIONS), dtype=np.uint32)
+                grown[:row] = self._run_signatures
+                self._run_signatures = grown
+        self._run_info[row] = (key, name, stars)
+        self._run_signatures[row] = signature
+        for band, bucket in enumerate(buckets):
+            self._run_buckets.setdefault((band, bucket), set()).add(row)
+        if not persist:
+            return
+        self._db.execute("DELETE FROM buckets WHERE key = ?", (key,))
+        self._db.execute("INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)",
+                         (key, name, stars, signature.astype("<u4").tobytes()))
+        self._db.executemany("INSERT OR IGNORE INTO buckets VALUES (?, ?, ?)",
+                             [(band, bucket, key) for band, bucket in enumerate(buckets)])
+
+    def commit(self):
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def index_item(item, index, key=lambda item: normalize_url(item["url"])):
+    """Persist an item as a canonical copy without checking it, e.g. one listed or proposed"""
+    signature = minhash(item)
+    if signature is not None:
+        index.add(key(item), item.get("full_name", item["name"]), item.get("stars", 0), signature)
+
+
+def suppress_near_duplicates(items, index, key=lambda item: normalize_url(item["url"]),
+                             persist=True):
+    """Split items into (kept, duplicates), checking each against the index
+
+    Signatures and stored bucket lookups are computed for the whole batch at
+    once. Items are then visited most-starred first, so within a cluster the
+    most-starred one is kept and indexed (for this run only unless persist); an item is a
+    duplicate if the index already holds a near-duplicate with at least as
+    many stars. duplicates is a list of (item, name of the canonical item,
+    key of the canonical item).
+    """
+    kept, duplicates = [], []
+    items = sorted(items, key=lambda item: item.get("stars", 0), reverse=True)
+    signatures = minhashes(items)
+    signed = [signature for signature in signatures if signature is not None]
+    stored = iter(index.stored_candidates(signed))
+    buckets = iter(band_hashes_many(signed).tolist() if signed else [])
+    for item, signature in zip(items, signatures):
+        if signature is None:
+            kept.append(item)
+            continue
+        stars = item.get("stars", 0)
+        item_key = key(item)
+        item_buckets = next(buckets)
+        matches = index.matches(item_key, signature, next(stored), item_buckets)
+        if matches and matches[0][2] >= stars:
+            duplicates.append((item, matches[0][1], matches[0][0]))
+            continue
+        index.add(item_key, item.get("full_name", item["name"]), stars, signature, persist,
+                  item_buckets)
+        kept.append(item)
+    return kept, duplicates
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+In-memory index of the awesome list in README.md
+
+Parses every "## Section" table of the list in a single pass and indexes the
+rows by section, by normalized link URL and by normalized title, so the
+crawler can tell in O(1) whether a candidate is already listed (and where)
+before spending any API calls on it.
+"""
+
+import re
+from collections import namedtuple
+from urllib.parse import urlsplit, urlunsplit
+
+Row = namedtuple("Row", ["title", "description", "type", "url", "line"])
+
+LINK_PATTERN = re.compile(r"\[[^\]]*\]\(([^)\s]+)\)")
+SEPARATOR_PATTERN = re.compile(r"^\|[\s:|-]+\|$")
+
+
+def normalize_url(url):
+    """Normalize a URL so trivially different spellings compare equal"""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    if path.endswith(".git"):
+        path = path[:-4]
+    if host in ("github.com", "gitlab.com"):
+        path = path.lower()
+    return urlunsplit(("https", host, path, parts.query, ""))
+
+
+def normalize_title(title):
+    """Normalize a title for case- and punctuation-insensitive lookups"""
+    return " ".join(re.sub(r"[^\w\s]", " ", title.lower()).split())
+
+
+def split_row(line):
+    """Split a Markdown table row into stripped cell strings"""
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def iter_table_rows(readme_content):
+    """Yield (section, line number, cells) for each data row of the "## Section" tables
+
+    The first row of every table is its header; separator rows are skipped.
+    """
+    section = None
+    header_seen = False
+    for number, line in enumerate(readme_content.split("\n"), start=1):
+        if line.startswith("## "):
+            section = line[3:].strip()
+            header_seen = False
+            continue
+        if section is None or not line.startswith("|"):
+            header_seen = False
+            continue
+        if not header_seen:
+            # First row of a table is its header
+            header_seen = True
+            continue
+        if SEPARATOR_PATTERN.match(line.strip()):
+            continue
+        yield section, number, split_row(line)
+
+
+class ReadmeIndex:
+    """Sections, rows and URL/title lookups for the awesome list"""
+
+    def __init__(self):
+        self.sections = {}
+        self.by_url = {}
+        self.by_title = {}
+
+    @classmethod
+    def from_markdown(cls, readme_content):
+        """Build the index in one pass over the README text"""
+        index = cls()
+        for section, number, cells in iter_table_rows(readme_content):
+            if len(cells) < 4:
+                continue
+            link = LINK_PATTERN.search(cells[3])
+            index.add(section, Row(cells[0], cells[1], cells[2],
+                                   link.group(1) if link else None, number))
+        return index
+
+    def add(self, section, row):
+        """Add a row (e.g. a freshly accepted candidate) to the index"""
+        self.sections.setdefault(section, []).append(row)
+        if row.url:
+            self.by_url.setdefault(normalize_url(row.url), (section, row))
+        self.by_title.setdefault(normalize_title(row.title), (section, row))
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.sections.values())
+
+    def contains_url(self, url):
+        """Check if a URL is already listed"""
+        return bool(url) and normalize_url(url) in self.by_url
+
+    def lookup_url(self, url):
+        """Return (section, row) for a listed URL, or None"""
+        return self.by_url.get(normalize_url(url)) if url else None
+
+    def section_of(self, url_or_title):
+        """Return the section listing a URL or title, or None"""
+        match = self.lookup_url(url_or_title) or self.by_title.get(normalize_title(url_or_title))
+        return match[0] if match else None
+
+    def rows(self, section):
+        """Return the rows of a section in README order"""
+        return list(self.sections.get(section, []))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Repository content signals for crawl candidates
+
+Looks past a repository's name, description and topics at what it actually
+contains: whether its root holds a Dockerfile or a compose file, and the
+first few KB of its README. Signals for many candidates are fetched at once
+by a bounded thread pool over the crawler's pooled (and ETag-cached) GitHub
+client, and never spend more than a fixed request budget.
+"""
+
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import REGISTRY
+
+README_SNIPPET_BYTES = 4096
+REQUESTS_PER_REPO = 2
+MAX_WORKERS = 16
+COMPOSE_FILES = {"docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml"}
+RAW_MEDIA_TYPE = "application/vnd.github.raw+json"
+
+
+class RequestBudget:
+    """Thread-safe count of the requests enrichment may still spend"""
+
+    def __init__(self, limit):
+        self._lock = threading.Lock()
+        self.remaining = limit
+
+    def take(self, count):
+        """Reserve count requests, returning False once the budget can't cover them"""
+        with self._lock:
+            if self.remaining < count:
+                return False
+            self.remaining -= count
+            return True
+
+
+def container_files(names):
+    """Return (has a Dockerfile, has a compose file) for a directory listing"""
+    names = [name.lower() for name in names]
+    has_dockerfile = any(name == "dockerfile" or name.startswith("dockerfile.") or
+                         name.endswith(".dockerfile") for name in names)
+    has_compose = any(name in COMPOSE_FILES for name in names)
+    return has_dockerfile, has_compose
+
+
+def fetch_signals(api, full_name):
+    """Fetch one repository's content signals with two requests"""
+    try:
+        listing = api.get_json(f"/repos/{full_name}/contents/")
+        names = [entry["name"] for entry in listing if entry.get("type") == "file"]
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
+        names = []  # Empty repository
+
+    try:
+        response = api.request("GET", f"/repos/{full_name}/readme",
+                               headers={"Accept": RAW_MEDIA_TYPE})
+        readme = response.content[:README_SNIPPET_BYTES].decode("utf-8", errors="ignore")
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 404:
+            raise
+        readme = ""
+
+    has_dockerfile, has_compose = container_files(names)
+    return {"dockerfile": has_dockerfile, "compose": has_compose, "readme": readme}
+
+
+def fetch_all_signals(full_names, api, budget, max_workers=MAX_WORKERS):
+    """Fetch signals for many repositories concurrently, returning {full_name: signals}
+
+    Repositories left over once the budget is spent, or whose fetch failed,
+    are missing from the result.
+    """
+    def fetch(full_name):
+        if not budget.take(REQUESTS_PER_REPO):
+            REGISTRY.inc("signals_skipped", reason="budget")
+            return full_name, None
+        try:
+            signals = fetch_signals(api, full_name)
+        except requests.RequestException as e:
+            print(f"Warning: Could not fetch content signals for {full_name}: {e}")
+            REGISTRY.inc("signals_skipped", reason="error")
+            return full_name, None
+        REGISTRY.inc("signals_fetched")
+        return full_name, signals
+
+    full_names = list(full_names)
+    if not full_names:
+        return {}
+    workers = max(1, min(max_workers, len(full_names)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return {name: signals for name, signals in executor.map(fetch, full_names) if signals}
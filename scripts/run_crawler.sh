@@ -1,6 +1,6 @@
 #!/bin/bash
 
-# This script combines and runs the GitHub crawler
+# This script runs the GitHub crawler
 
 # Check if GITHUB_TOKEN is set
 if [ -z "$GITHUB_TOKEN" ]; then
@@ -9,9 +9,6 @@ if [ -z "$GITHUB_TOKEN" ]; then
     exit 1
 fi
 
-# Combine the crawler script parts
-cat github_crawler.py github_crawler_part2.py > crawler_combined.py
-
 # Parse arguments
 DRY_RUN=""
 DAYS=7
@@ -40,7 +37,4 @@ while [ $# -gt 0 ]; do
 done
 
 # Run the crawler
-python crawler_combined.py --days "$DAYS" --limit "$LIMIT" $DRY_RUN
-
-# Clean up
-rm crawler_combined.py
+python "$(dirname "$0")/github_crawler.py" --days "$DAYS" --limit "$LIMIT" $DRY_RUN
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Date-sharded repository search past GitHub's 1000-result cap
+
+GitHub search never returns more than 1000 results for one query, so a broad
+query over a long pushed: window is silently truncated. Every crawler search
+goes through the planner, which probes how many repositories a query matches
+(a window under the cap is a single shard) and, while a shard matches more
+than the cap, splits its pushed: date range in half (and, once the range
+can't usefully shrink, its stars: range), probing the halves in parallel.
+Every leaf shard then fits under the cap.
+
+Planning and fetching are lazy and go newest pushes first: a leaf shard's
+pages are fetched one at a time as the caller reads on (each full_name is
+yielded once), and once the caller stops no further shard is probed or page
+fetched, so a limited search spends only the quota it needs.
+
+A probe asks for a page of the caller's page size, so a shard that fits in
+one page is complete after the probe itself and needs no further request.
+All requests go through the shared GitHubAPI, which keeps them within the
+search budget.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from github_api import SEARCH_RESULT_CAP, MAX_PER_PAGE
+from metrics import REGISTRY
+
+MIN_SHARD_SPAN = timedelta(minutes=1)
+MAX_WORKERS = 8
+
+
+def _timestamp(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Shard:
+    """One slice of a search: a pushed: range and an optional stars: range"""
+
+    def __init__(self, query, start, end, stars=None):
+        self.query = query
+        self.start = start
+        self.end = end
+        self.stars = stars  # (low, high or None for no upper bound)
+
+    def __str__(self):
+        text = f"{self.query} pushed:{_timestamp(self.start)}..{_timestamp(self.end)}"
+        if self.stars:
+            low, high = self.stars
+            text += f" stars:{low}..{'*' if high is None else high}"
+        return text
+
+    def split(self):
+        """Halve the date range, or the stars range once dates can't shrink; None if neither can"""
+        if self.end - self.start >= 2 * MIN_SHARD_SPAN:
+            middle = self.start + (self.end - self.start) / 2
+            return [Shard(self.query, self.start, middle, self.stars),
+                    Shard(self.query, middle, self.end, self.stars)]
+        low, high = self.stars or (0, None)
+        if high is None:
+            # Open-ended: peel off a bounded range that doubles each time
+            middle = low * 2 + 1
+        elif low < high:
+            middle = (low + high) // 2
+        else:
+            return None
+        return [Shard(self.query, self.start, self.end, (low, middle)),
+                Shard(self.query, self.start, self.end, (middle + 1, high))]
+
+
+def probe(api, shard, per_page=MAX_PER_PAGE):
+    """Return (total_count, first page of items) for a shard"""
+    body = api.get_json("/search/repositories",
+                        params={"q": str(shard), "per_page": per_page,
+                                "sort": "updated", "order": "desc"})
+    REGISTRY.inc("search_shard_probes")
+    return body["total_count"], body["items"]
+
+
+def plan(api, query, start, end, cap=SEARCH_RESULT_CAP, per_page=MAX_PER_PAGE,
+         max_workers=MAX_WORKERS):
+    """Yield the shards of a search that each fit under the cap, newest pushes first
+
+    Yields (shard, total_count, first page of items). A shard over the cap
+    is split and its parts probed in parallel; shards are only probed when
+    the caller asks for the next leaf.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        root = Shard(query, start, end)
+        stack = [(root, probe(api, root, per_page))]
+        while stack:
+            shard, (total, items) = stack.pop()
+            parts = shard.split() if total > cap else None
+            if parts:
+                # Parts come oldest (or fewest stars) first; the stack pops the newest first
+                probes = executor.map(lambda part: probe(api, part, per_page), parts)
+                stack.extend(zip(parts, probes))
+                continue
+            if total > cap:
+                print(f"Warning: {shard} matches {total} repositories and can't be split further; "
+                      f"only the first {cap} are returned")
+            REGISTRY.inc("search_shards")
+            yield shard, total, items
+
+
+def _read_shard(api, shard, total, items, per_page):
+    """Yield a planned shard's results, fetching each page after the probe's only when asked"""
+    available = min(total, SEARCH_RESULT_CAP)
+    read = 0
+    page = 1
+    while True:
+        yield from items
+        read += len(items)
+        if len(items) < per_page or read >= available:
+            return
+        page += 1
+        items = api.get_json("/search/repositories",
+                             params={"q": str(shard), "per_page": per_page, "page": page,
+                                     "sort": "updated", "order": "desc"})["items"]
+
+
+def sharded_search(api, query, start, end, limit=None, per_page=MAX_PER_PAGE,
+                   max_workers=MAX_WORKERS, truncated=None):
+    """Yield every repository matching query pushed between start and end
+
+    Newest shards come first and each full_name is yielded once. Pages of
+    per_page results are fetched one at a time, only once the caller has
+    read the previous one, so a caller that stops early (or after limit
+    results, if given) pays for no page it didn't need. truncated, if given,
+    is called for a shard that matches more than the cap even after
+    splitting, whose results past the cap can't be read.
+    """
+    leaves = plan(api, query, start, end, per_page=per_page, max_workers=max_workers)
+    seen = set()
+    try:
+        for shard, total, items in leaves:
+            if total > SEARCH_RESULT_CAP and truncated:
+                truncated()
+            for item in _read_shard(api, shard, total, items, per_page):
+                if item["full_name"] in seen:
+                    continue
+                seen.add(item["full_name"])
+                yield item
+                if limit is not None and len(seen) >= limit:
+                    return
+    finally:
+        leaves.close()
@@ -27,7 +27,16 @@ mkdir -p "$TARGET_DIR"
 # Copy all files from the tweet-scheduler directory
 cp -r * "$TARGET_DIR"
 
-echo "Files have been copied to $TARGET_DIR"
+# Ship the modules shared with the crawler alongside, and build the image from them
+SCRIPTS_DIR="$(dirname "$0")/../scripts"
+mkdir -p "$TARGET_DIR/shared"
+for module in catalog.py http_cache.py metrics.py link_checker.py readme_index.py; do
+    cp "$SCRIPTS_DIR/$module" "$TARGET_DIR/shared/"
+done
+sed -i.bak 's|shared: \.\./scripts|shared: ./shared|' "$TARGET_DIR/docker-compose.yml"
+rm -f "$TARGET_DIR/docker-compose.yml.bak"
+
+echo "Files have been copied to $TARGET_DIR (shared modules in $TARGET_DIR/shared)"
 echo "Now navigate to your kubetools repository and commit the changes:"
 echo "cd $KUBETOOLS_PATH"
 echo "git add tweet-scheduler"
@@ -3,15 +3,14 @@
 Tweet Scheduler for Kubetools
 
 This script automatically tweets about Kubernetes tools from the kubetools repository
-at a specified interval (default: 1 hour).
+at a specified interval (default: 1 hour). With --config it instead runs any number
+of feeds, each with its own README, tweet template, credentials and schedule, side
+by side in one process.
 
 Requirements:
 - tweepy
-- PyGithub
+- requests
 - python-dotenv
-- pandas
-- beautifulsoup4
-- markdown
 
 Setup:
 1. Create a Twitter Developer account and get API credentials
@@ -21,26 +20,64 @@ Setup:
    - TWITTER_ACCESS_TOKEN
    - TWITTER_ACCESS_SECRET
    - GITHUB_TOKEN (optional, for higher API rate limits)
+   - HTTP_CACHE_FILE (optional, where conditional-request responses are cached)
+   - GITHUB_API_URL (optional, e.g. a local scripts/fake_github.py for testing)
+   - CATALOG_SNAPSHOT_FILE (optional, where the parsed tool catalog is kept between restarts)
+   - METRICS_PORT (optional, serve Prometheus metrics on this port; same as --metrics-port)
 
 Usage:
-python tweet-scheduler.py [--interval HOURS]
+python tweet-scheduler.py [--interval HOURS] [--refresh-minutes MINUTES] [--metrics-port PORT]
+python tweet-scheduler.py --config feeds.json [--metrics-port PORT]
+
+The config is a JSON object with a "feeds" list (see feeds.example.json). Each feed
+has a "name" and may set "repo" ("owner/name"), "readme_path" (a README, or a
+catalog.jsonl as written by scripts/catalog.py), "columns" (table column of each
+tool field, for READMEs), "template", "credentials_prefix" (prepended to the
+TWITTER_* variable names), either "schedule" (a cron expression) or
+"interval_hours", "refresh_minutes", "history_file", "snapshot_file" and
+"outbox_file".
+
+Tweets are rendered once and queued in a durable outbox (SQLite) before they
+are posted. Failed posts are retried with exponential backoff and jitter, or at
+Twitter's rate-limit reset time, and undelivered tweets survive a restart.
 """
 
 import os
 import re
 import time
+import asyncio
+import sqlite3
 import random
 import argparse
 import logging
 import json
-import pandas as pd
+import base64
+import threading
+import html
+import requests
+from collections import deque
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
-import tweepy
-import markdown
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from github import Github
+
+try:
+    # Shared with the crawler (scripts/http_cache.py); optional outside the container
+    from http_cache import ResponseCache, cached_session
+except ImportError:
+    ResponseCache = None
+
+try:
+    # Shared with the crawler (scripts/metrics.py); optional outside the container
+    from metrics import REGISTRY as metrics
+except ImportError:
+    metrics = None
+
+try:
+    # Results of scripts/link_checker.py; optional outside the container
+    from link_checker import LinkStore
+except ImportError:
+    LinkStore = None
 
 # Configure logging
 logging.basicConfig(
@@ -60,15 +97,33 @@ load_dotenv()
 REPO_OWNER = "ajeetraina"  # Updated to your forked repository
 REPO_NAME = "kubetools"
 README_PATH = "README.md"
-HISTORY_FILE = "tweet_history.json"
+HISTORY_FILE = "tweet_history.jsonl"
+OUTBOX_FILE = "tweet_outbox.sqlite"
+HTTP_CACHE_FILE = os.getenv("HTTP_CACHE_FILE", "http_cache.sqlite")
+CATALOG_SNAPSHOT_FILE = os.getenv("CATALOG_SNAPSHOT_FILE", "catalog_snapshot.json")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
 MAX_TWEET_LENGTH = 280  # Twitter character limit
+DEFAULT_REFRESH_MINUTES = 30  # How often the README is re-checked for new tools
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+LINK_STATUS_FILE = os.getenv("LINK_STATUS_FILE", "")  # Skip tools whose link was found broken
+RETRY_BASE_DELAY = 5  # Seconds before the first retry of a failed post, doubled after each attempt
+RETRY_MAX_DELAY = 15 * 60
+MAX_DELIVERY_ATTEMPTS = 12
+DEFAULT_COLUMNS = {"name": 1, "description": 2, "url": 2, "popularity": 3}
+# {url} is the tool's URL followed by a blank line, or nothing if it has none
+DEFAULT_TWEET_TEMPLATE = ("🔧 #Kubernetes Tool: {name} - Category: {category}\n\n"
+                          "{description}\n\n"
+                          "{url}#Kubetools #Kubernetes #K8s #CloudNative")
 
-def setup_twitter_api():
+def setup_twitter_api(credentials_prefix=""):
     """Set up and return the Twitter API client using credentials from environment variables."""
-    api_key = os.getenv("TWITTER_API_KEY")
-    api_secret = os.getenv("TWITTER_API_SECRET")
-    access_token = os.getenv("TWITTER_ACCESS_TOKEN")
-    access_secret = os.getenv("TWITTER_ACCESS_SECRET")
+    # Imported here so loading the catalog doesn't wait on tweepy's import
+    import tweepy
+    
+    api_key = os.getenv(f"{credentials_prefix}TWITTER_API_KEY")
+    api_secret = os.getenv(f"{credentials_prefix}TWITTER_API_SECRET")
+    access_token = os.getenv(f"{credentials_prefix}TWITTER_ACCESS_TOKEN")
+    access_secret = os.getenv(f"{credentials_prefix}TWITTER_ACCESS_SECRET")
     
     if not all([api_key, api_secret, access_token, access_secret]):
         raise ValueError("Twitter API credentials not found. Please set all required environment variables.")
@@ -76,203 +131,889 @@ def setup_twitter_api():
     auth = tweepy.OAuth1UserHandler(api_key, api_secret, access_token, access_secret)
     return tweepy.API(auth)
 
-def get_readme_content():
-    """Fetch the README.md content from GitHub repository."""
+def count(name, value=1, **labels):
+    """Add to a metrics counter, when metrics are available."""
+    if metrics:
+        metrics.inc(name, value, **labels)
+
+def gauge(name, value, **labels):
+    """Set a metrics gauge, when metrics are available."""
+    if metrics:
+        metrics.set(name, value, **labels)
+
+def timed(phase, **labels):
+    """Time a block as one run of a phase, when metrics are available."""
+    return metrics.timer(phase, **labels) if metrics else nullcontext()
+
+def record_cache_stats(registry, cache):
+    """Copy the HTTP cache's hit/miss counters into the metrics before an export."""
+    for name, value in cache.stats().items():
+        registry.set(f"http_cache_{name}", value)
+
+_http_session = None
+
+def get_http_session():
+    """Return the shared HTTP session, revalidating responses against a disk cache when available."""
+    global _http_session
+    if _http_session is None:
+        if ResponseCache is not None:
+            cache = ResponseCache(HTTP_CACHE_FILE)
+            _http_session = cached_session(cache)
+            if metrics:
+                metrics.collect(lambda registry: record_cache_stats(registry, cache))
+        else:
+            _http_session = requests.Session()
+    return _http_session
+
+def github_headers():
+    """Headers for a GitHub API request; sent per request so the token never reaches other hosts."""
+    headers = {"Accept": "application/vnd.github+json"}
     token = os.getenv("GITHUB_TOKEN")
     if token:
-        g = Github(token)
-    else:
-        g = Github()
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+CRON_FIELDS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+def parse_cron_field(field, low, high):
+    """Expand one cron field ("*", "5", "1-5", "*/15", "0-30/10", lists of those) to a set."""
+    values = set()
+    for part in field.split(','):
+        step = 1
+        if '/' in part:
+            part, step = part.split('/')
+            step = int(step)
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-'))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        # Sunday may be written as 7 as well as 0
+        top = 7 if high == 6 else high
+        if start < low or end > top or start > end or step < 1:
+            raise ValueError(f"Invalid cron field: {field}")
+        values.update(value % 7 if top == 7 else value for value in range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+    """A five-field cron expression (minute hour day-of-month month day-of-week)."""
+    
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs five fields: {expression}")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS))
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+    
+    def __str__(self):
+        return f"cron '{self.expression}'"
     
-    repo = g.get_repo(f"{REPO_OWNER}/{REPO_NAME}")
-    readme_content = repo.get_contents(README_PATH).decoded_content.decode("utf-8")
-    return readme_content
+    def _day_matches(self, when):
+        in_days = when.day in self.days
+        in_weekdays = (when.weekday() + 1) % 7 in self.weekdays
+        # As in cron, a day matches either field when both are restricted
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+    
+    def next_run(self, after, first=False):
+        """Return the first matching minute after the given datetime."""
+        when = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + timedelta(days=5 * 366)
+        while when <= limit:
+            if when.month not in self.months:
+                when = (when.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(when):
+                when = when.replace(hour=0, minute=0) + timedelta(days=1)
+            elif when.hour not in self.hours:
+                when = when.replace(minute=0) + timedelta(hours=1)
+            elif when.minute not in self.minutes:
+                when += timedelta(minutes=1)
+            else:
+                return when
+        raise ValueError(f"Cron expression never matches: {self.expression}")
 
-def extract_tools_from_readme(readme_content):
-    """Parse the README content and extract all tools with their details."""
-    # Convert markdown to HTML
-    html = markdown.markdown(readme_content)
-    soup = BeautifulSoup(html, 'html.parser')
+class IntervalSchedule:
+    """Tweet right away, then every interval_hours."""
+    
+    def __init__(self, interval_hours):
+        if interval_hours <= 0:
+            raise ValueError("interval_hours must be positive")
+        self.interval_hours = interval_hours
     
+    def __str__(self):
+        return f"every {self.interval_hours} hours"
+    
+    def next_run(self, after, first=False):
+        return after if first else after + timedelta(hours=self.interval_hours)
+
+class Feed:
+    """One list to tweet from: where its README lives, how tweets look, and when they go out."""
+    
+    def __init__(self, name, repo=f"{REPO_OWNER}/{REPO_NAME}", readme_path=README_PATH,
+                 columns=None, template=DEFAULT_TWEET_TEMPLATE, credentials_prefix="",
+                 schedule=None, interval_hours=1.0, refresh_minutes=DEFAULT_REFRESH_MINUTES,
+                 history_file=None, snapshot_file=None, outbox_file=None):
+        self.name = name
+        self.repo = repo
+        self.readme_path = readme_path
+        self.columns = dict(DEFAULT_COLUMNS, **(columns or {}))
+        self.template = template
+        self.credentials_prefix = credentials_prefix
+        self.schedule = CronSchedule(schedule) if schedule else IntervalSchedule(interval_hours)
+        self.refresh_minutes = refresh_minutes
+        self.history_file = history_file or f"{name}_tweet_history.jsonl"
+        self.snapshot_file = snapshot_file or f"{name}_catalog_snapshot.json"
+        self.outbox_file = outbox_file or f"{name}_outbox.sqlite"
+        self.logger = logger.getChild(name)
+
+def load_feeds(path):
+    """Load the feeds from a JSON config file."""
+    with open(path, 'r') as f:
+        config = json.load(f)
+    
+    feeds = []
+    for entry in config["feeds"]:
+        try:
+            feed = Feed(**entry)
+            # A schedule that never matches would otherwise only fail once the feed runs
+            feed.schedule.next_run(datetime.now(), first=True)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid feed {entry.get('name')!r} in {path}: {e}")
+        feeds.append(feed)
+    
+    names = [feed.name for feed in feeds]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Feed names in {path} must be unique")
+    return feeds
+
+# The single feed run when no config is given, with the original file names
+DEFAULT_FEED = Feed(REPO_NAME, history_file=HISTORY_FILE, snapshot_file=CATALOG_SNAPSHOT_FILE,
+                    outbox_file=OUTBOX_FILE)
+
+def fetch_readme(feed, etag=None):
+    """Fetch a feed's README, returning (content, blob SHA, ETag), or None if it still matches etag."""
+    url = f"{GITHUB_API_URL}/repos/{feed.repo}/contents/{feed.readme_path}"
+    headers = github_headers()
+    if etag:
+        headers["If-None-Match"] = etag
+    with timed("readme_fetch", feed=feed.name):
+        response = get_http_session().get(url, headers=headers, timeout=30)
+    count("github_api_requests", method="GET", endpoint="/repos/{owner}/{repo}/contents",
+          status=response.status_code, cache="hit" if getattr(response, "from_cache", False) else "miss")
+    if "X-RateLimit-Remaining" in response.headers:
+        gauge("github_rate_limit_remaining", int(response.headers["X-RateLimit-Remaining"]), resource="core")
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    payload = response.json()
+    readme_content = base64.b64decode(payload["content"]).decode("utf-8")
+    return readme_content, payload["sha"], response.headers.get("ETag")
+
+def get_readme_content():
+    """Fetch the README.md content from GitHub repository."""
+    return fetch_readme(DEFAULT_FEED)[0]
+
+SKIP_CATEGORIES = ["Table of Contents", "Contributors", "Maintainer"]
+
+# Inline Markdown, reduced to the text a reader sees
+IMAGE_PATTERN = re.compile(r'!\[([^\]]*)\]\([^)]*\)')
+LINK_PATTERN = re.compile(r'\[([^\]]*)\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+HTML_LINK_PATTERN = re.compile(r'<a\s[^>]*href=["\']([^"\']+)["\']', re.IGNORECASE)
+AUTOLINK_PATTERN = re.compile(r'<(https?://[^>\s]+)>')
+EMPHASIS_PATTERN = re.compile(r'(\*\*|__|\*|_|~~|`)(.+?)\1')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+CELL_SPLIT_PATTERN = re.compile(r'(?<!\\)\|')
+SEPARATOR_ROW_PATTERN = re.compile(r'^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$')
+
+def markdown_text(value):
+    """Render inline Markdown to plain text (what the HTML's .text would be)."""
+    value = IMAGE_PATTERN.sub('', value)
+    value = LINK_PATTERN.sub(r'\1', value)
+    value = AUTOLINK_PATTERN.sub(r'\1', value)
+    value = EMPHASIS_PATTERN.sub(r'\2', value)
+    value = TAG_PATTERN.sub('', value)
+    return html.unescape(value.replace('\\|', '|')).strip()
+
+def first_link(value):
+    """Return the URL of the first link in inline Markdown, or None."""
+    value = IMAGE_PATTERN.sub('', value)
+    matches = [m for m in (LINK_PATTERN.search(value), HTML_LINK_PATTERN.search(value),
+                           AUTOLINK_PATTERN.search(value)) if m]
+    if not matches:
+        return None
+    first = min(matches, key=lambda m: m.start())
+    return first.group(2) if first.re is LINK_PATTERN else first.group(1)
+
+def split_table_row(line):
+    """Split a Markdown table row into its raw cells, honouring escaped pipes."""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [cell.strip() for cell in CELL_SPLIT_PATTERN.split(line)]
+
+def extract_tools_from_readme(readme_content, columns=DEFAULT_COLUMNS):
+    """Parse the README content and extract all tools with their details.
+
+    Reads "## " headings and pipe tables line by line in a single pass, so
+    each table is only ever attributed to the section it appears in. columns
+    maps each tool field to the table column it is read from.
+    """
     tools = []
     current_category = None
+    in_table = False
+    min_cells = max(columns.values()) + 1
     
-    # Find all h2 elements (category headers) and tables
-    h2_elements = soup.find_all('h2')
-    
-    for h2 in h2_elements:
-        # Skip certain categories that don't contain tools
-        skip_categories = ["Table of Contents", "Contributors", "Maintainer"]
-        if h2.text in skip_categories:
+    for line in readme_content.splitlines():
+        stripped = line.strip()
+        
+        if line.startswith('## '):
+            current_category = markdown_text(line[3:].strip().rstrip('#').strip())
+            # Skip certain categories that don't contain tools
+            if current_category in SKIP_CATEGORIES:
+                current_category = None
+            in_table = False
             continue
         
-        current_category = h2.text
+        if not stripped.startswith('|'):
+            in_table = False
+            continue
+        if current_category is None:
+            continue
+        if not in_table:
+            # First row of a table is its header
+            in_table = True
+            continue
+        if SEPARATOR_ROW_PATTERN.match(stripped):
+            continue
         
-        # Find the table after this h2
-        table = h2.find_next('table')
-        if not table:
+        cells = split_table_row(stripped)
+        if len(cells) < min_cells:  # Ensure we have all expected columns
             continue
         
-        # Process each row in the table
-        rows = table.find_all('tr')
-        if len(rows) <= 1:  # Skip if only header row exists
+        tools.append({
+            "category": current_category,
+            "name": markdown_text(cells[columns["name"]]),
+            "description": markdown_text(cells[columns["description"]]),
+            "url": first_link(cells[columns["url"]]),
+            # GitHub popularity indicator if available
+            "popularity": markdown_text(cells[columns["popularity"]])
+        })
+    
+    logger.info(f"Extracted {len(tools)} tools from README")
+    return tools
+
+def extract_tools_from_jsonl(catalog_content):
+    """Extract all tools from a catalog of one JSON entry per line (scripts/catalog.py).
+
+    Entries carry their section, title, description, type and URL as fields,
+    so no table has to be parsed; the type stands in for popularity.
+    """
+    tools = []
+    for line in catalog_content.splitlines():
+        if not line.strip():
             continue
-            
-        # Skip header row
-        for row in rows[1:]:
-            cells = row.find_all('td')
-            if len(cells) >= 4:  # Ensure we have all expected columns
-                # Extract tool info
+        entry = json.loads(line)
+        if entry["section"] in SKIP_CATEGORIES:
+            continue
+        tools.append({
+            "category": markdown_text(entry["section"]),
+            "name": markdown_text(entry["title"]),
+            "description": markdown_text(entry["description"]),
+            "url": entry.get("url"),
+            "popularity": markdown_text(entry.get("type", ""))
+        })
+    
+    logger.info(f"Extracted {len(tools)} tools from catalog")
+    return tools
+
+def extract_tools(feed, content):
+    """Extract a feed's tools from its README, or from its catalog if it reads a .jsonl file."""
+    if feed.readme_path.endswith(".jsonl"):
+        return extract_tools_from_jsonl(content)
+    return extract_tools_from_readme(content, feed.columns)
+
+SNAPSHOT_FIELDS = ["category", "name", "description", "url", "popularity"]
+
+def load_catalog_snapshot(feed):
+    """Load the feed's saved tool catalog, or None if there is no usable snapshot."""
+    try:
+        with open(feed.snapshot_file, 'r') as f:
+            snapshot = json.load(f)
+        if snapshot.get("fields") != SNAPSHOT_FIELDS or snapshot.get("columns", DEFAULT_COLUMNS) != feed.columns:
+            return None
+        return {
+            "sha": snapshot["sha"],
+            "etag": snapshot.get("etag"),
+            "tools": [dict(zip(SNAPSHOT_FIELDS, row)) for row in snapshot["tools"]]
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_catalog_snapshot(feed, catalog):
+    """Save the tool catalog as one row per tool, keyed by the README blob SHA."""
+    snapshot = {
+        "sha": catalog["sha"],
+        "etag": catalog["etag"],
+        "columns": feed.columns,
+        "fields": SNAPSHOT_FIELDS,
+        "tools": [[tool[field] for field in SNAPSHOT_FIELDS] for tool in catalog["tools"]]
+    }
+    # Write then rename, so a restart mid-write never sees half a snapshot
+    temp_path = f"{feed.snapshot_file}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+    os.replace(temp_path, feed.snapshot_file)
+
+def refresh_catalog(feed, catalog):
+    """Re-check the README with a conditional request, returning a new catalog or None if unchanged."""
+    readme = fetch_readme(feed, catalog["etag"])
+    if readme is None:
+        return None
+    
+    readme_content, sha, etag = readme
+    if sha == catalog["sha"]:
+        # Same blob behind a different ETag; remember the ETag for the next check
+        catalog["etag"] = etag
+        return None
+    with timed("readme_parse", feed=feed.name):
+        tools = extract_tools(feed, readme_content)
+    return {"sha": sha, "etag": etag, "tools": tools}
+
+def load_catalog(feed):
+    """Return the feed's tool catalog, re-parsing the README only when its blob SHA changed."""
+    snapshot = load_catalog_snapshot(feed)
+    if snapshot is None:
+        readme_content, sha, etag = fetch_readme(feed)
+        with timed("readme_parse", feed=feed.name):
+            tools = extract_tools(feed, readme_content)
+        catalog = {"sha": sha, "etag": etag, "tools": tools}
+        save_catalog_snapshot(feed, catalog)
+        return catalog
+    
+    etag = snapshot["etag"]
+    try:
+        catalog = refresh_catalog(feed, snapshot)
+    except requests.RequestException as e:
+        feed.logger.warning(f"Could not check README ({e}); using the saved catalog")
+        return snapshot
+    
+    if catalog is None:
+        feed.logger.info(f"README blob {snapshot['sha'][:7]} unchanged; loaded {len(snapshot['tools'])} tools from snapshot")
+        if snapshot["etag"] != etag:
+            save_catalog_snapshot(feed, snapshot)
+        return snapshot
+    
+    save_catalog_snapshot(feed, catalog)
+    return catalog
+
+def tool_key(tool):
+    """Identify a tool across README revisions."""
+    return (tool["category"], tool["name"])
+
+def diff_catalogs(old_tools, new_tools):
+    """Compare two tool lists by key, returning (added, removed, changed) tools."""
+    old = {tool_key(tool): tool for tool in old_tools}
+    new = {tool_key(tool): tool for tool in new_tools}
+    added = [tool for key, tool in new.items() if key not in old]
+    removed = [tool for key, tool in old.items() if key not in new]
+    changed = [tool for key, tool in new.items() if key in old and old[key] != tool]
+    return added, removed, changed
+
+class TweetHistory:
+    """Append-only log of delivered tweets, one JSON object per line."""
+    
+    def __init__(self, path=HISTORY_FILE):
+        self.path = Path(path)
+    
+    def entries(self):
+        """Yield every logged tweet, oldest first."""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
                 try:
-                    tool_name = cells[1].text.strip()
-                    
-                    # Extract description and URL
-                    description_cell = cells[2]
-                    
-                    # Check if there's a link in the description
-                    link = description_cell.find('a')
-                    if link:
-                        url = link.get('href')
-                        # Extract just the description text, not including the URL
-                        description = description_cell.text.strip()
-                    else:
-                        url = None
-                        description = description_cell.text.strip()
-                    
-                    # Extract GitHub popularity indicator if available
-                    popularity = cells[3].text.strip()
-                    
-                    tools.append({
-                        "category": current_category,
-                        "name": tool_name,
-                        "description": description,
-                        "url": url,
-                        "popularity": popularity
-                    })
-                except Exception as e:
-                    logger.warning(f"Error extracting tool info: {e}")
+                    yield json.loads(line)
+                except ValueError:
+                    # A write cut short by a crash; everything before it is intact
                     continue
     
-    logger.info(f"Extracted {len(tools)} tools from README")
-    return tools
+    def append(self, tool, epoch):
+        """Record one tweet with a single small write."""
+        entry = {"name": tool["name"], "category": tool["category"], "epoch": epoch,
+                 "tweeted_at": datetime.now().isoformat()}
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
 
-def load_tweet_history():
-    """Load the history of previously tweeted tools."""
-    history_path = Path(HISTORY_FILE)
-    if history_path.exists():
-        with open(history_path, 'r') as f:
-            return json.load(f)
-    return {"last_tweeted": None, "tweeted_tools": []}
-
-def save_tweet_history(history):
-    """Save the updated tweet history."""
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
-
-def select_tool_to_tweet(tools, history):
-    """Select a tool to tweet, prioritizing ones that haven't been tweeted yet."""
-    tweeted_tools = set(history["tweeted_tools"])
-    
-    # Filter out already tweeted tools
-    untweeted_tools = [tool for tool in tools if tool["name"] not in tweeted_tools]
-    
-    if untweeted_tools:
-        # Select a random tool from untweeted ones
-        selected_tool = random.choice(untweeted_tools)
-    else:
-        # If all tools have been tweeted, reset and select randomly from all tools
-        logger.info("All tools have been tweeted. Resetting selection pool.")
-        selected_tool = random.choice(tools)
+def load_tweet_history(feed=DEFAULT_FEED):
+    """Open the feed's tweet log, importing an old JSON history (tweet_history.json) the first time."""
+    history = TweetHistory(feed.history_file)
+    legacy_path = history.path.with_suffix(".json")
+    if not history.path.exists() and legacy_path.exists():
+        with open(legacy_path, 'r') as f:
+            legacy = json.load(f)
+        with open(history.path, 'w') as f:
+            for name in legacy.get("tweeted_tools", []):
+                f.write(json.dumps({"name": name, "category": None, "epoch": 0,
+                                    "tweeted_at": legacy.get("last_tweeted")}) + "\n")
+        feed.logger.info(f"Imported {len(legacy.get('tweeted_tools', []))} tweets from {legacy_path}")
+    return history
+
+class ToolPool:
+    """The tools available for selection, updated in place as the README changes.
+    
+    Tools are tweeted in a shuffled rotation: every epoch each tool is tweeted
+    once, in random order, before a new epoch reshuffles them all. The queue
+    of remaining tools isn't stored; it is rebuilt on startup from the tweets
+    logged for the current epoch, so a tweet costs one appended line.
+    """
+    
+    def __init__(self, tools, history=None):
+        self._lock = threading.Lock()
+        self._tools = {tool_key(tool): tool for tool in tools}
+        self.history = history
+        self.epoch = 0
+        done = set()
+        done_names = set()
+        for entry in history.entries() if history else ():
+            if entry["epoch"] != self.epoch:
+                self.epoch = entry["epoch"]
+                done.clear()
+                done_names.clear()
+            if entry["category"] is None:
+                # Imported from the old history, which only kept names
+                done_names.add(entry["name"])
+            else:
+                done.add((entry["category"], entry["name"]))
+        
+        self._done = {key for key in self._tools if key in done or key[1] in done_names}
+        remaining = [key for key in self._tools if key not in self._done]
+        self._start_rotation(remaining)
+    
+    def __len__(self):
+        return len(self._tools)
+    
+    def _start_rotation(self, keys):
+        random.shuffle(keys)
+        self._queue = deque(keys)
+        self._remaining = set(keys)
     
-    return selected_tool
+    def tools(self):
+        """Return the current tools as a list."""
+        with self._lock:
+            return list(self._tools.values())
+    
+    def next_tool(self):
+        """Return the next tool in the rotation without taking it off, or None if there are no tools."""
+        with self._lock:
+            while True:
+                if not self._queue:
+                    if not self._tools:
+                        return None
+                    self.epoch += 1
+                    self._done = set()
+                    logger.info(f"All tools have been tweeted. Starting rotation {self.epoch}.")
+                    self._start_rotation(list(self._tools))
+                key = self._queue[0]
+                if key in self._remaining and key in self._tools:
+                    return self._tools[key]
+                # Removed from the README (or queued twice) since the rotation started
+                self._queue.popleft()
+    
+    def record_tweet(self, tool):
+        """Take a tweeted tool off the rotation and log it."""
+        epoch = self.take(tool)
+        if epoch is not None and self.history:
+            self.history.append(tool, epoch)
+    
+    def skip(self, tool):
+        """Take a tool off the current rotation without tweeting it."""
+        self.take(tool)
+    
+    def take(self, tool):
+        """Take a tool off the current rotation, returning the rotation's epoch (None if it wasn't in it)."""
+        key = tool_key(tool)
+        with self._lock:
+            if key not in self._remaining:
+                return None
+            if self._queue and self._queue[0] == key:
+                self._queue.popleft()
+            self._remaining.discard(key)
+            self._done.add(key)
+            return self.epoch
+    
+    def apply(self, added, removed, changed):
+        """Apply a catalog diff; new tools join the current rotation at a random place."""
+        with self._lock:
+            for tool in removed:
+                key = tool_key(tool)
+                self._tools.pop(key, None)
+                self._remaining.discard(key)
+            for tool in changed:
+                self._tools[tool_key(tool)] = tool
+            for tool in added:
+                key = tool_key(tool)
+                self._tools[key] = tool
+                if key not in self._remaining and key not in self._done:
+                    self._queue.insert(random.randint(0, len(self._queue)), key)
+                    self._remaining.add(key)
 
-def create_tweet_text(tool):
-    """Create the tweet text for a selected tool."""
-    # Basic information
-    tweet = f"🔧 #Kubernetes Tool: {tool['name']} - Category: {tool['category']}\n\n"
+class CatalogRefresher:
+    """Background task that polls a feed's README and keeps its ToolPool current."""
+    
+    def __init__(self, feed, catalog, pool):
+        self.feed = feed
+        self.catalog = catalog
+        self.pool = pool
+        self.interval = feed.refresh_minutes * 60
+    
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.feed.logger.error(f"Error refreshing tool catalog: {e}")
     
+    async def refresh(self):
+        """Check the README once and apply any changes to the pool."""
+        etag = self.catalog["etag"]
+        catalog = await asyncio.to_thread(refresh_catalog, self.feed, self.catalog)
+        if catalog is None:
+            if self.catalog["etag"] != etag:
+                save_catalog_snapshot(self.feed, self.catalog)
+            return
+        if not catalog["tools"]:
+            self.feed.logger.warning(f"No tools extracted from README blob {catalog['sha'][:7]}; keeping the current pool")
+            return
+        
+        added, removed, changed = diff_catalogs(self.catalog["tools"], catalog["tools"])
+        self.pool.apply(added, removed, changed)
+        gauge("tweet_tools_available", len(self.pool), feed=self.feed.name)
+        self.catalog = catalog
+        save_catalog_snapshot(self.feed, catalog)
+        self.feed.logger.info(f"README updated to blob {catalog['sha'][:7]}: {len(added)} added, "
+                              f"{len(removed)} removed, {len(changed)} changed; {len(self.pool)} tools available")
+
+def select_tool_to_tweet(pool, links=None):
+    """Select the next tool to tweet from the pool's rotation.
+    
+    With a LinkStore, tools whose link the link checker found broken are
+    taken off the rotation and passed over.
+    """
+    tool = pool.next_tool()
+    if links is None:
+        return tool
+    for _ in range(len(pool)):
+        if tool is None or not links.is_broken(tool['url']):
+            return tool
+        logger.warning(f"Skipping {tool['name']}: its link {tool['url']} was found broken")
+        count("tweet_tools_skipped", reason="broken_link")
+        pool.skip(tool)
+        tool = pool.next_tool()
+    return None
+
+def create_tweet_text(tool, template=DEFAULT_TWEET_TEMPLATE):
+    """Create the tweet text for a selected tool."""
     # Add description, limiting to fit within tweet length
     description = tool['description']
     # Extract just the tool description without the URL
     description = re.sub(r'\[.*?\]|\(.*?\)', '', description).strip()
     
+    # Add URL if available
+    fields = dict(tool, description="", url=f"{tool['url']}\n\n" if tool['url'] else "")
+    
     # Handle long descriptions
-    max_desc_length = MAX_TWEET_LENGTH - len(tweet) - 30  # Allow space for URL and hashtags
+    max_desc_length = MAX_TWEET_LENGTH - len(template.format(**fields))
     if len(description) > max_desc_length:
-        description = description[:max_desc_length-3] + "..."
+        description = description[:max_desc_length-3] + "..." if max_desc_length > 3 else ""
     
-    tweet += description + "\n\n"
+    return template.format(**dict(fields, description=description))
+
+class Outbox:
+    """Durable queue of rendered tweets waiting to be posted, kept in SQLite."""
     
-    # Add URL if available
-    if tool['url']:
-        tweet += f"{tool['url']}\n\n"
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                category TEXT,
+                text TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL,
+                created_at REAL NOT NULL,
+                last_error TEXT,
+                epoch INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt);
+        """)
+        columns = [row["name"] for row in self.conn.execute("PRAGMA table_info(outbox)")]
+        if "epoch" not in columns:
+            # Outboxes from before tweets were logged on delivery; their rows are already logged
+            self.conn.execute("ALTER TABLE outbox ADD COLUMN epoch INTEGER")
+            self.conn.commit()
+    
+    def put(self, tool, text, epoch):
+        """Queue a tweet for delivery as soon as possible; epoch is the rotation it is logged under."""
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO outbox (name, category, text, next_attempt, created_at, epoch) VALUES (?, ?, ?, ?, ?, ?)",
+            (tool["name"], tool["category"], text, now, now, epoch))
+        self.conn.commit()
+    
+    def pending(self):
+        """Return every pending tweet."""
+        return self.conn.execute("SELECT * FROM outbox WHERE status = 'pending'").fetchall()
+    
+    def next_due(self):
+        """Return the pending tweet that is due first, or None."""
+        return self.conn.execute(
+            "SELECT * FROM outbox WHERE status = 'pending' ORDER BY next_attempt, id LIMIT 1").fetchone()
+    
+    def pending_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+    
+    def delivered(self, item):
+        # The tweet log records it from here on; nothing left to keep
+        self.conn.execute("DELETE FROM outbox WHERE id = ?", (item["id"],))
+        self.conn.commit()
+    
+    def retry(self, item, delay, error):
+        self.conn.execute(
+            "UPDATE outbox SET attempts = attempts + 1, next_attempt = ?, last_error = ? WHERE id = ?",
+            (time.time() + delay, error, item["id"]))
+        self.conn.commit()
     
-    # Add hashtags
-    tweet += "#Kubetools #Kubernetes #K8s #CloudNative"
+    def failed(self, item, error):
+        # Kept (with the error) for inspection, but never retried
+        self.conn.execute(
+            "UPDATE outbox SET status = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+            (error, item["id"]))
+        self.conn.commit()
     
-    return tweet
+    def close(self):
+        self.conn.close()
 
-def tweet_tool(api, tool):
-    """Post a tweet about the selected tool."""
-    tweet_text = create_tweet_text(tool)
+def rate_limit_reset(error):
+    """Return when Twitter's rate limit resets (epoch seconds) if error is a 429, else None."""
+    import tweepy
+    if not isinstance(error, tweepy.TooManyRequests):
+        return None
+    reset = error.response.headers.get("x-rate-limit-reset")
+    return float(reset) if reset else time.time() + RETRY_MAX_DELAY
+
+def retry_delay(error, attempts):
+    """Seconds to wait before retrying a failed post, or None if retrying won't help."""
+    import tweepy
+    reset = rate_limit_reset(error)
+    if reset is not None:
+        return max(reset - time.time(), 0) + random.uniform(0, RETRY_BASE_DELAY)
+    if isinstance(error, tweepy.HTTPException) and not isinstance(error, tweepy.TwitterServerError):
+        # Other 4xx errors (duplicate status, bad credentials, ...) fail the same way every time
+        return None
+    # Server errors and network failures: exponential backoff with jitter
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempts)
+    return random.uniform(delay / 2, delay)
+
+class DeliveryWorker:
+    """Posts a feed's outbox in order, retrying failures without blocking the schedule."""
     
-    try:
-        api.update_status(tweet_text)
-        logger.info(f"Successfully tweeted about {tool['name']}")
-        return True
-    except Exception as e:
-        logger.error(f"Error posting tweet: {e}")
-        return False
+    def __init__(self, feed, api, outbox, history=None):
+        self.feed = feed
+        self.api = api
+        self.outbox = outbox
+        self.history = history
+        self.wake = asyncio.Event()
+        self.blocked_until = 0  # Rate limit reset time; nothing is posted before it
+    
+    def notify(self):
+        """Wake the worker up after a tweet was queued."""
+        self.wake.set()
+    
+    async def run(self):
+        while True:
+            self.wake.clear()
+            try:
+                item = self.outbox.next_due()
+                if item is not None:
+                    wait = max(item["next_attempt"], self.blocked_until) - time.time()
+                    if wait <= 0:
+                        await self.deliver(item)
+                        continue
+                else:
+                    wait = None
+            except Exception as e:
+                self.feed.logger.error(f"Error in delivery worker: {e}")
+                wait = RETRY_BASE_DELAY
+            
+            try:
+                await asyncio.wait_for(self.wake.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def deliver(self, item):
+        """Post one queued tweet, scheduling a retry if that fails."""
+        log = self.feed.logger
+        feed = self.feed.name
+        try:
+            with timed("tweet_post", feed=feed):
+                await asyncio.to_thread(self.api.update_status, item["text"])
+        except Exception as e:
+            delay = retry_delay(e, item["attempts"])
+            if delay is None or item["attempts"] + 1 >= MAX_DELIVERY_ATTEMPTS:
+                self.outbox.failed(item, str(e))
+                count("tweets", feed=feed, outcome="failed")
+                log.error(f"Error posting tweet about {item['name']}, giving up: {e}")
+                return
+            
+            reset = rate_limit_reset(e)
+            if reset is not None:
+                self.blocked_until = reset
+                gauge("twitter_rate_limit_remaining", 0, feed=feed)
+            self.outbox.retry(item, delay, str(e))
+            count("tweets", feed=feed, outcome="retried")
+            log.warning(f"Error posting tweet about {item['name']} (attempt {item['attempts'] + 1}): {e}; "
+                        f"retrying in {delay:.0f}s")
+            return
+        
+        if self.history and item["epoch"] is not None:
+            # Only a posted tweet counts as tweeted; a failed one leaves no trace in the log
+            self.history.append(item, item["epoch"])
+        self.outbox.delivered(item)
+        count("tweets", feed=feed, outcome="delivered")
+        gauge("tweet_outbox_pending", self.outbox.pending_count(), feed=feed)
+        response = getattr(self.api, "last_response", None)
+        if response is not None and "x-rate-limit-remaining" in response.headers:
+            gauge("twitter_rate_limit_remaining", int(response.headers["x-rate-limit-remaining"]), feed=feed)
+        log.info(f"Successfully tweeted about {item['name']}")
 
-def run_scheduler(interval_hours=1):
-    """Run the scheduler to tweet at the specified interval."""
+async def run_feed(feed):
+    """Tweet from one feed on its schedule until cancelled."""
+    log = feed.logger
+    tasks = []
+    outbox = None
+    links = None
     try:
         # Set up Twitter API
-        api = setup_twitter_api()
-        logger.info("Twitter API initialized successfully")
+        api = await asyncio.to_thread(setup_twitter_api, feed.credentials_prefix)
+        log.info("Twitter API initialized successfully")
         
-        # Get README content and extract tools
-        readme_content = get_readme_content()
-        tools = extract_tools_from_readme(readme_content)
+        # Get the tool catalog, from the snapshot if the README hasn't changed
+        catalog = await asyncio.to_thread(load_catalog, feed)
         
-        if not tools:
-            logger.error("No tools extracted from README. Exiting.")
+        if not catalog["tools"]:
+            log.error("No tools extracted from README. Stopping this feed.")
             return
         
-        # Load tweet history
-        history = load_tweet_history()
+        # Keep the pool current in the background while the loop below posts
+        history = load_tweet_history(feed)
+        pool = ToolPool(catalog["tools"], history)
+        if feed.refresh_minutes > 0:
+            tasks.append(asyncio.create_task(CatalogRefresher(feed, catalog, pool).run()))
         
+        # Tweets go out through the outbox, picking up any left from the last run
+        outbox = Outbox(feed.outbox_file)
+        pending = outbox.pending_count()
+        if pending:
+            log.info(f"Resuming delivery of {pending} queued tweets")
+            for item in outbox.pending():
+                # Not logged until posted, so keep the rotation from picking them again
+                if item["epoch"] == pool.epoch:
+                    pool.take(item)
+        worker = DeliveryWorker(feed, api, outbox, history)
+        tasks.append(asyncio.create_task(worker.run()))
+        
+        links = LinkStore(LINK_STATUS_FILE) if LinkStore and LINK_STATUS_FILE else None
+    except Exception as e:
+        log.error(f"Error starting feed: {e}")
+        for task in tasks:
+            task.cancel()
+        if outbox:
+            outbox.close()
+        return
+    
+    try:
+        next_tweet_time = feed.schedule.next_run(datetime.now(), first=True)
         while True:
-            # Select a tool
-            tool = select_tool_to_tweet(tools, history)
-            logger.info(f"Selected tool to tweet: {tool['name']}")
+            await asyncio.sleep(max(0, (next_tweet_time - datetime.now()).total_seconds()))
             
-            # Tweet the tool
-            success = tweet_tool(api, tool)
-            
-            if success:
-                # Update history
-                if tool["name"] not in history["tweeted_tools"]:
-                    history["tweeted_tools"].append(tool["name"])
-                history["last_tweeted"] = datetime.now().isoformat()
-                save_tweet_history(history)
+            try:
+                if outbox.pending_count():
+                    # Don't let a backlog build up and burst out once posting works again
+                    log.warning("Previous tweet is still waiting to be delivered; skipping this slot")
+                else:
+                    # Select a tool
+                    tool = select_tool_to_tweet(pool, links)
+                    if tool is None:
+                        log.warning("No tools available to tweet")
+                    else:
+                        log.info(f"Selected tool to tweet: {tool['name']}")
+                        
+                        # Queue the tweet, taking the tool off the rotation; the
+                        # worker logs it once it is actually posted
+                        epoch = pool.take(tool)
+                        outbox.put(tool, create_tweet_text(tool, feed.template), epoch)
+                        worker.notify()
+                gauge("tweet_outbox_pending", outbox.pending_count(), feed=feed.name)
+                gauge("tweet_tools_available", len(pool), feed=feed.name)
+                gauge("tweet_rotation_epoch", pool.epoch, feed=feed.name)
+            except Exception as e:
+                count("scheduler_errors", feed=feed.name)
+                log.error(f"Error in scheduler: {e}")
             
-            # Wait for the next interval
-            next_tweet_time = datetime.now() + timedelta(hours=interval_hours)
-            logger.info(f"Next tweet scheduled for: {next_tweet_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            time.sleep(interval_hours * 3600)
-    
-    except Exception as e:
-        logger.error(f"Error in scheduler: {e}")
+            # Wait for the next scheduled time
+            next_tweet_time = feed.schedule.next_run(datetime.now())
+            log.info(f"Next tweet scheduled for: {next_tweet_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        outbox.close()
+        if links is not None:
+            links.close()
+
+async def run_scheduler(feeds):
+    """Run every feed concurrently in one event loop."""
+    await asyncio.gather(*(run_feed(feed) for feed in feeds))
 
 def main():
     """Main function to parse arguments and start the scheduler."""
     parser = argparse.ArgumentParser(description="Tweet scheduler for Kubetools")
     parser.add_argument("--interval", type=float, default=1.0, help="Interval between tweets in hours (default: 1)")
+    parser.add_argument("--refresh-minutes", type=float, default=DEFAULT_REFRESH_MINUTES,
+                        help=f"How often to check the README for new tools, 0 to disable (default: {DEFAULT_REFRESH_MINUTES})")
+    parser.add_argument("--config", help="JSON file of feeds to run instead of the single kubetools feed")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                        help="Serve Prometheus metrics on this port at /metrics, 0 to disable (default: $METRICS_PORT or 0)")
     args = parser.parse_args()
     
-    logger.info(f"Starting tweet scheduler with interval of {args.interval} hours")
-    run_scheduler(interval_hours=args.interval)
+    if args.metrics_port:
+        if metrics:
+            metrics.serve(args.metrics_port)
+            logger.info(f"Serving Prometheus metrics on port {args.metrics_port} at /metrics")
+        else:
+            logger.warning("metrics.py not found; not serving metrics")
+    
+    if args.config:
+        feeds = load_feeds(args.config)
+    else:
+        feeds = [Feed(REPO_NAME, history_file=HISTORY_FILE, snapshot_file=CATALOG_SNAPSHOT_FILE,
+                      outbox_file=OUTBOX_FILE, interval_hours=args.interval,
+                      refresh_minutes=args.refresh_minutes)]
+    
+    for feed in feeds:
+        logger.info(f"Starting feed {feed.name} ({feed.repo}) tweeting {feed.schedule}")
+    asyncio.run(run_scheduler(feeds))
 
 if __name__ == "__main__":
     main()